@@ -0,0 +1,11 @@
+# The session is imported lazily, such that modules not depending on pyvista,
+# e.g. latviz.preview, can be used without importing it.
+__all__ = ["LatViz"]
+
+
+def __getattr__(name: str):
+    if name == "LatViz":
+        from latviz.session import LatViz
+
+        return LatViz
+    raise AttributeError(f"module 'latviz' has no attribute '{name}'")
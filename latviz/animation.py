@@ -0,0 +1,283 @@
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from latviz.metrics import metrics
+from latviz.utils import natural_sort_key
+
+
+def _ffmpeg_command(
+    animation_type: str,
+    input_paths: Path,
+    animation_path: Path,
+    frame_rate: Optional[int] = 10,
+    start_number: Optional[int] = None,
+    n_frames: Optional[int] = None,
+) -> list[str]:
+    """
+    Builds the ffmpeg command for encoding frames to an animation.
+
+    Args:
+        animation_type: format of animation. Available: 'avi' or 'mp4'.
+        input_paths: printf style pattern of the frame paths.
+        animation_path: path of the encoded animation.
+        frame_rate: frames per second of animation.
+        start_number: optional, number of the first frame to encode.
+        n_frames: optional, number of frames to encode.
+
+    Raises:
+        NameError: if animation_type is not recognized.
+    """
+
+    if animation_type == "mp4":
+        cmd = [
+            "ffmpeg",
+            "-r",
+            str(frame_rate),
+            "-start_number",
+            str(start_number or 0),
+            "-i",
+            str(input_paths),
+            "-c:v",
+            "libx264",
+            "-crf",
+            "0",
+            "-preset",
+            "veryslow",
+            "-c:a",
+            "libmp3lame",
+            "-b:a",
+            "320k",
+        ]
+
+    elif animation_type == "avi":
+        cmd = ["ffmpeg", "-r", str(frame_rate)]
+        if start_number is not None:
+            cmd += ["-start_number", str(start_number)]
+        cmd += ["-i", str(input_paths), "-qscale:v", "0"]
+
+    else:
+        raise NameError(
+            f"{animation_type} is not a recognized animation type."
+        )
+
+    if n_frames is not None:
+        cmd += ["-frames:v", str(n_frames)]
+
+    return cmd + ["-y", str(animation_path)]
+
+
+def _frame_paths(frame_folder: Path, frame_format: str) -> list[Path]:
+    """Frames of a folder, in natural order of their frame numbers."""
+    return sorted(
+        frame_folder.glob(f"frame_t*.{frame_format}"),
+        key=lambda f: natural_sort_key(f.name),
+    )
+
+
+def _concat_entry(path: Path) -> str:
+    """Line of a ffmpeg concat list, with single quotes escaped as '\\''."""
+    escaped = str(path.resolve()).replace("'", "'\\''")
+    return f"file '{escaped}'\n"
+
+
+def _encode_segments(
+    animation_type: str,
+    input_paths: Path,
+    animation_path: Path,
+    n_frames: int,
+    frame_rate: Optional[int] = 10,
+    n_jobs: int = 2,
+    segment_frames: int = 250,
+) -> None:
+    """
+    Encodes frames as independent segments in parallel, and joins them.
+
+    The segments are encoded with the same settings as a single pass
+    encoding, and joined by the ffmpeg concat demuxer without re-encoding.
+
+    Args:
+        animation_type: format of animation. Available: 'avi' or 'mp4'.
+        input_paths: printf style pattern of the frame paths.
+        animation_path: path of the encoded animation.
+        n_frames: number of frames to encode.
+        frame_rate: frames per second of animation.
+        n_jobs: number of segments to encode in parallel.
+        segment_frames: number of frames per segment.
+
+    Raises:
+        subprocess.CalledProcessError: if ffmpeg fails.
+    """
+
+    with tempfile.TemporaryDirectory(
+        suffix="_segments", dir=animation_path.parent
+    ) as segment_folder:
+        segment_folder_path = Path(segment_folder)
+
+        segment_cmds = []
+        segment_paths = []
+        for i, start in enumerate(range(0, n_frames, segment_frames)):
+            segment_path = segment_folder_path / (
+                f"segment_{i:04d}.{animation_type}"
+            )
+            segment_cmds.append(
+                _ffmpeg_command(
+                    animation_type,
+                    input_paths,
+                    segment_path,
+                    frame_rate=frame_rate,
+                    start_number=start,
+                    n_frames=min(segment_frames, n_frames - start),
+                )
+            )
+            segment_paths.append(segment_path)
+
+        logger.info(
+            f"Encoding {len(segment_cmds)} segments with {n_jobs} processes."
+        )
+
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            for proc in executor.map(
+                lambda cmd: subprocess.run(
+                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+                ),
+                segment_cmds,
+            ):
+                proc.check_returncode()
+                metrics.advance()
+
+        concat_list = segment_folder_path / "segments.txt"
+        concat_list.write_text(
+            "".join(_concat_entry(f) for f in segment_paths)
+        )
+
+        cmd = [
+            "ffmpeg",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(concat_list),
+            "-c",
+            "copy",
+            "-y",
+            str(animation_path),
+        ]
+
+        logger.info(f"Running command: {' '.join(cmd)}")
+
+        subprocess.run(cmd, stdout=subprocess.PIPE, check=True)
+
+
+def create_animation(
+    frame_folder: Path,
+    animation_folder: Path,
+    observable: str,
+    animation_type: str,
+    time_slice: Optional[int] = None,
+    frame_rate: Optional[int] = 10,
+    name_suffix: Optional[str] = None,
+    n_jobs: int = 1,
+    segment_frames: int = 250,
+    frame_format: str = "png",
+) -> None:
+    """
+    Method for creating animations from generated volumetric figures.
+
+    Args:
+        frame_folder: folder path to figures that will be be stitched together.
+        animation_folder: folder path to place animations in.
+        observable: observable we are creating an animation..
+        animation_type: format of animation. Available: 'gif', 'avi' or 'mp4'
+        time_slice: optional, eucl time slice.
+        frame_rate: frames per second of animation.
+        name_suffix: optional suffix appended to the animation name, e.g. to
+            label the camera view.
+        n_jobs: number of ffmpeg processes. If larger than one, animations
+            with more than segment_frames frames are encoded as segments in
+            parallel, and joined afterwards. Does not apply to 'gif'.
+        segment_frames: number of frames per segment.
+        frame_format: format of the frames. Available: 'png' or 'webp'.
+
+    Raises:
+        NameError: if animation_type is not recognized.
+        ValueError: if the frame format cannot be encoded, or n_jobs or
+            segment_frames is not positive.
+    """
+
+    if frame_format not in ("png", "webp"):
+        raise ValueError(
+            f"{frame_format} frames cannot be encoded to an animation."
+        )
+
+    if n_jobs < 1 or segment_frames < 1:
+        raise ValueError(
+            f"n_jobs={n_jobs} and segment_frames={segment_frames} must be "
+            "positive integers."
+        )
+
+    # Removes spaces
+    observable = observable.replace(" ", "_")
+
+    if name_suffix:
+        observable = f"{observable}_{name_suffix}"
+
+    input_paths = frame_folder / f"frame_t%02d.{frame_format}"
+
+    if time_slice:
+        animation_path = animation_folder / (
+            f"{observable.lower()}_{time_slice}.{animation_type}"
+        )
+    else:
+        animation_path = animation_folder / (
+            f"{observable.lower()}.{animation_type}"
+        )
+
+    if animation_type == "gif":
+        cmd = [
+            "convert",
+            "-delay",
+            "1",
+            "-loop",
+            "0",
+            *[str(f) for f in _frame_paths(frame_folder, frame_format)],
+            str(animation_path),
+        ]
+
+    else:
+        cmd = _ffmpeg_command(
+            animation_type, input_paths, animation_path, frame_rate=frame_rate
+        )
+
+        n_frames = len(_frame_paths(frame_folder, frame_format))
+        if n_jobs > 1 and n_frames > segment_frames:
+            metrics.start_stage(
+                "encoding", total=-(-n_frames // segment_frames)
+            )
+            _encode_segments(
+                animation_type,
+                input_paths,
+                animation_path,
+                n_frames,
+                frame_rate=frame_rate,
+                n_jobs=n_jobs,
+                segment_frames=segment_frames,
+            )
+            metrics.increment("animations_encoded")
+            logger.success(f"Animation {animation_path} created.")
+            return
+
+    logger.info(f"Running command: {' '.join(cmd)}")
+    metrics.start_stage("encoding", total=1)
+
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    _ = proc.stdout.read()  # type: ignore[union-attr]
+
+    metrics.advance()
+    metrics.increment("animations_encoded")
+    logger.success(f"Animation {animation_path} created.")
@@ -0,0 +1,203 @@
+import glob
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from latviz.utils import natural_sort_key
+
+CATALOG_VERSION = 2
+
+
+def default_cache_dir() -> Path:
+    """Returns the folder catalogs are cached in."""
+    cache_home = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_home) / "latviz"
+
+
+def expand_inputs(
+    inputs: Iterable[str], suffix: str = ".bin"
+) -> tuple[list[Path], set[Path]]:
+    """
+    Expands input files, directories and glob patterns to file paths.
+
+    Args:
+        inputs: file paths, directories or glob patterns. Directories are
+            expanded to the files in them with the given suffix.
+        suffix: file suffix to look for in directories.
+
+    Raises:
+        FileNotFoundError: if an input does not match any files.
+
+    Returns:
+        the expanded file paths, and the folders they were found in.
+    """
+    paths = []
+    folders = set()
+
+    for pattern in inputs:
+        path = Path(pattern)
+
+        if path.is_dir():
+            matches = [
+                path / entry.name
+                for entry in os.scandir(path)
+                if entry.is_file() and entry.name.endswith(suffix)
+            ]
+            folders.add(path)
+        elif path.is_file():
+            matches = [path]
+        elif glob.has_magic(pattern):
+            matches = [Path(f) for f in glob.glob(pattern, recursive=True)]
+            matches = [f for f in matches if f.is_file()]
+
+            # Base folder of the pattern, such that new matches are detected
+            base = Path(pattern.split("*")[0].split("?")[0].split("[")[0])
+            folders.add(base if base.is_dir() else base.parent)
+        else:
+            matches = []
+
+        if len(matches) == 0:
+            raise FileNotFoundError(f"No files found matching {pattern}.")
+
+        paths.extend(matches)
+        folders.update(f.parent for f in matches)
+
+    return paths, folders
+
+
+def _folder_state(folders: Iterable[Path]) -> dict[str, int]:
+    """Modification times of the folders, changing when files are added."""
+    return {
+        str(folder.resolve()): folder.stat().st_mtime_ns for folder in folders
+    }
+
+
+def _file_state(
+    paths: list[Path], n_workers: int = 16
+) -> list[tuple[int, int]]:
+    """Sizes and modification times of the files, stat'ed in parallel."""
+
+    def _state(path: Path) -> tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    with ThreadPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(_state, paths))
+
+
+def _catalog_cache_path(
+    inputs: list[str], n: int, nt: int, cache_dir: Path
+) -> Path:
+    """Cache file of the catalog for a set of inputs."""
+    key = json.dumps(
+        {
+            "version": CATALOG_VERSION,
+            "cwd": os.getcwd(),
+            "inputs": inputs,
+            "n": n,
+            "nt": nt,
+        }
+    )
+    return cache_dir / f"catalog_{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+
+def build_catalog(
+    inputs: Iterable[str],
+    n: int,
+    nt: int,
+    itemsize: int = 8,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None,
+    n_workers: int = 16,
+) -> list[Path]:
+    """
+    Builds a naturally sorted catalog of configuration files.
+
+    The inputs are expanded, the file sizes validated against a hypercube of
+    shape (n, n, n, nt) and the files sorted by their configuration number.
+    The catalog is cached on disk, and reused as long as no files are added
+    to or removed from the folders of the catalog, and the sizes and
+    modification times of the files are unchanged.
+
+    Args:
+        inputs: file paths, directories or glob patterns.
+        n: spatial points.
+        nt: temporal points.
+        itemsize: bytes per lattice point.
+        use_cache: if true, reads and writes the catalog cache.
+        cache_dir: folder to cache catalogs in. Defaults to
+            $XDG_CACHE_HOME/latviz.
+        n_workers: number of threads used to stat the files.
+
+    Raises:
+        FileNotFoundError: if an input does not match any files.
+        ValueError: if a file does not have the expected size.
+
+    Returns:
+        list of paths to the configurations, in natural order.
+    """
+    inputs = list(inputs)
+
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+
+    cache_path = _catalog_cache_path(inputs, n, nt, cache_dir)
+
+    if use_cache and cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text())
+            cached_paths = [Path(f) for f in cache["files"]]
+            if all(
+                Path(folder).stat().st_mtime_ns == mtime
+                for folder, mtime in cache["folders"].items()
+            ) and _file_state(cached_paths, n_workers) == [
+                tuple(state) for state in cache["states"]
+            ]:
+                logger.info(f"Using cached catalog {str(cache_path)}")
+                return cached_paths
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    paths, folders = expand_inputs(inputs)
+
+    # Removes duplicates, and sorts by the configuration number
+    paths = sorted(set(paths), key=lambda f: natural_sort_key(str(f)))
+
+    states = _file_state(paths, n_workers)
+
+    expected_size = n ** 3 * nt * itemsize
+    invalid = [
+        str(f) for f, (size, _) in zip(paths, states) if size != expected_size
+    ]
+    if invalid:
+        raise ValueError(
+            f"{len(invalid)} file(s) do not have the expected size "
+            f"n**3 * nt * itemsize = {expected_size} bytes: "
+            f"{', '.join(invalid[:5])}"
+            f"{', ...' if len(invalid) > 5 else ''}"
+        )
+
+    logger.info(f"Catalog of {len(paths)} files created.")
+
+    if use_cache:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        "folders": _folder_state(folders),
+                        "files": [str(f) for f in paths],
+                        "states": states,
+                    }
+                )
+            )
+        except OSError as e:
+            logger.warning(f"Could not cache catalog: {e}")
+
+    return paths
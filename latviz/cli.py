@@ -1,17 +1,21 @@
 import datetime
+import shutil
 from pathlib import Path
+from typing import Optional
 
 import click  # type: ignore[import]
 from loguru import logger  # type: ignore[import]
 
-from latviz.latviz import create_animation, plot_iso_surface
+from latviz.animation import create_animation
+from latviz.catalog import build_catalog
+from latviz.metrics import metrics
+from latviz.preview import render_preview
+from latviz.transforms import parse_transform
 from latviz.utils import load_fields
 
 
 @click.command(context_settings={"show_default": True})
-@click.argument(
-    "field_paths", nargs=-1, type=click.Path(exists=True, path_type=Path)
-)
+@click.argument("field_inputs", nargs=-1, type=str)
 @click.option("-n", required=True, type=int, help="Spatial dimensions.")
 @click.option("-nt", required=True, type=int, help="Temporal dimensions.")
 @click.option(
@@ -24,6 +28,32 @@ from latviz.utils import load_fields
         "provided."
     ),
 )
+@click.option(
+    "--no-catalog-cache",
+    default=False,
+    is_flag=True,
+    help="If true, will not read or write the cached file catalog.",
+)
+@click.option(
+    "--time-range",
+    type=(int, int),
+    default=None,
+    help=(
+        "Range [start, stop) of time slices to average over in case that "
+        "multiple fields/observables are provided. Replaces --time_slice."
+    ),
+)
+@click.option(
+    "--transform",
+    "transforms",
+    type=str,
+    multiple=True,
+    default=[],
+    help=(
+        "Transform applied to the frames while loading, in the given order. "
+        "Available: abs, square, rolling:WINDOW and smooth:SIGMA."
+    ),
+)
 @click.option(
     "-o",
     "--output-folder",
@@ -66,6 +96,21 @@ from latviz.utils import load_fields
     is_flag=True,
     help="If true, will keep individual frames used in animation.",
 )
+@click.option(
+    "--frame-format",
+    type=click.Choice(["png", "webp", "npy"]),
+    default="png",
+    help=(
+        "Format of the frames. WebP frames are lossless. Raw npy frames are "
+        "kept, and not encoded to an animation."
+    ),
+)
+@click.option(
+    "--png-compression",
+    type=click.IntRange(0, 9),
+    default=6,
+    help="Compression level of png frames. Lower is faster.",
+)
 @click.option(
     "-c",
     "--n_contours",
@@ -73,6 +118,44 @@ from latviz.utils import load_fields
     default=20,
     help="Number of contours to use.",
 )
+@click.option(
+    "--cmap",
+    type=str,
+    default="plasma",
+    help="Color map of the contours.",
+)
+@click.option(
+    "--sweep-n-contours",
+    type=int,
+    multiple=True,
+    default=[],
+    help=(
+        "Number of contours to sweep over. Can be repeated. Any sweep option "
+        "renders one animation per combination of the swept parameters, "
+        "loading the data only once."
+    ),
+)
+@click.option(
+    "--sweep-vmin",
+    type=float,
+    multiple=True,
+    default=[],
+    help="Minimum contour value to sweep over. Can be repeated.",
+)
+@click.option(
+    "--sweep-vmax",
+    type=float,
+    multiple=True,
+    default=[],
+    help="Maximum contour value to sweep over. Can be repeated.",
+)
+@click.option(
+    "--sweep-cmap",
+    type=str,
+    multiple=True,
+    default=[],
+    help="Color map to sweep over. Can be repeated.",
+)
 @click.option(
     "--camera-distance",
     type=float,
@@ -97,48 +180,206 @@ from latviz.utils import load_fields
     default=10,
     help="Frame rate of animation output.",
 )
+@click.option(
+    "--encode-jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help=(
+        "Number of parallel ffmpeg processes. Long animations are encoded as "
+        "segments in parallel, and joined losslessly afterwards."
+    ),
+)
+@click.option(
+    "--segment-frames",
+    type=click.IntRange(min=1),
+    default=250,
+    help="Number of frames per segment when encoding in parallel.",
+)
 @click.option(
     "--axis-labels",
     default=["X axis", "Y axis", "Z axis"],
     type=(str, str, str),
     help="Axis labels.",
 )
+@click.option(
+    "--view",
+    "views",
+    type=(float, float, float),
+    multiple=True,
+    default=[],
+    help=(
+        "Camera view given as azimuth, elevation (in degrees) and distance. "
+        "Can be repeated, creating one animation per view from a single "
+        "contour extraction per frame."
+    ),
+)
+@click.option(
+    "--orbit",
+    type=int,
+    default=None,
+    help=(
+        "Number of frames in a camera orbit around a single frame of the "
+        "field. The contours are extracted only once."
+    ),
+)
+@click.option(
+    "--orbit-elevation",
+    type=float,
+    default=20.0,
+    help="Camera elevation of the orbit in degrees.",
+)
+@click.option(
+    "--orbit-frame",
+    type=int,
+    default=0,
+    help="Frame of the field to orbit around.",
+)
+@click.option(
+    "--export-meshes",
+    default=False,
+    is_flag=True,
+    help=(
+        "If true, will export the contours as a mesh sequence for "
+        "interactive viewing, instead of rendering an animation."
+    ),
+)
+@click.option(
+    "--metrics-path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help=(
+        "Status file to periodically write throughput metrics to. Files "
+        "ending in .prom are written in the Prometheus textfile format, "
+        "others as JSON."
+    ),
+)
+@click.option(
+    "--metrics-interval",
+    type=float,
+    default=10.0,
+    help="Seconds between each write of the metrics.",
+)
+@click.option(
+    "--preview",
+    type=click.Choice(["slices", "mip"]),
+    default=None,
+    help=(
+        "Fast preview without rendering the volume, showing the three "
+        "orthogonal mid-planes(slices) or maximum intensity "
+        "projections(mip) of each frame."
+    ),
+)
 def latviz(
-    field_paths,
+    field_inputs,
     n,
     nt,
     time_slice,
+    no_catalog_cache,
+    time_range,
+    transforms,
     output_folder,
     animation_type,
     observable_name,
     vmin,
     vmax,
     keep_frames,
+    frame_format,
+    png_compression,
     n_contours,
+    cmap,
+    sweep_n_contours,
+    sweep_vmin,
+    sweep_vmax,
+    sweep_cmap,
     camera_distance,
     title,
     figsize,
     frame_rate,
+    encode_jobs,
+    segment_frames,
     axis_labels,
+    views,
+    orbit,
+    orbit_elevation,
+    orbit_frame,
+    export_meshes,
+    metrics_path,
+    metrics_interval,
+    preview,
 ):
     """Program for loading configurations and creating animations.
 
-    Takes a folder of configuration(s), and processes them.
+    Takes configuration(s) as file paths, folders or glob patterns, and
+    processes them in natural order of their configuration numbers.
 
     Assumes that each configuration is a binary .bin file, that has the shape
     (time, z, y, x) and have Fortran ordering.
     """
 
-    if len(field_paths) > 1 and time_slice is None:
+    is_sweep = bool(sweep_n_contours or sweep_vmin or sweep_vmax or sweep_cmap)
+    if preview is not None and (
+        export_meshes or views or orbit is not None or is_sweep
+    ):
+        raise click.UsageError(
+            "--preview cannot be combined with --export-meshes, --view, "
+            "--orbit or --sweep-* options."
+        )
+
+    if export_meshes and (views or orbit is not None or is_sweep):
+        raise click.UsageError(
+            "--export-meshes cannot be combined with --view, --orbit or "
+            "--sweep-* options."
+        )
+
+    if views and (orbit is not None or is_sweep):
+        raise click.UsageError(
+            "--view cannot be combined with --orbit or --sweep-* options."
+        )
+
+    if orbit is not None and is_sweep:
+        raise click.UsageError(
+            "--orbit cannot be combined with --sweep-* options."
+        )
+
+    try:
+        transform_list = [parse_transform(spec) for spec in transforms]
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--transform")
+
+    if metrics_path is not None:
+        metrics.start(metrics_path, interval=metrics_interval)
+        click.get_current_context().call_on_close(metrics.stop)
+
+    try:
+        field_paths = build_catalog(
+            field_inputs, n, nt, use_cache=not no_catalog_cache
+        )
+    except (FileNotFoundError, ValueError) as e:
+        raise click.BadParameter(str(e), param_hint="FIELD_INPUTS")
+
+    if len(field_paths) > 1 and time_slice is None and time_range is None:
         logger.warning(
             "Multiple fields provided but no time_slice is provided. Using "
             "time_slice = 0"
         )
         time_slice = 0
 
-    data = load_fields(field_paths, n, nt, time_slice=time_slice)
+    data = load_fields(
+        field_paths,
+        n,
+        nt,
+        time_slice=time_slice,
+        time_range=time_range,
+        transforms=transform_list,
+    )
     logger.info("Data loaded")
 
+    if orbit is not None and not 0 <= orbit_frame < len(data):
+        raise click.BadParameter(
+            f"{orbit_frame} is out of range for {len(data)} frames.",
+            param_hint="--orbit-frame",
+        )
+
     # Set up the output folders
     if output_folder is None:
         time_stamp = datetime.datetime.strftime(
@@ -154,35 +395,141 @@ def latviz(
             )
         output_folder.mkdir()
 
+    if preview is None:
+        # Imported here, such that previews do not import pyvista
+        from latviz.latviz import (
+            export_iso_surfaces,
+            orbit_views,
+            plot_iso_surface,
+            plot_orbit,
+            sweep_iso_surface,
+            sweep_variants,
+        )
+
+    if export_meshes:
+        mesh_name = "_".join(observable_name.lower().split(" "))
+        export_iso_surfaces(
+            data,
+            observable_name,
+            output_folder / f"{mesh_name}.lvmesh",
+            vmin=vmin,
+            vmax=vmax,
+            n_contours=n_contours,
+        )
+        return
+
     frames_folder = output_folder / "frames"
     frames_folder.mkdir()
 
-    plot_iso_surface(
-        data,
-        observable_name,
-        frames_folder,
-        vmin=vmin,
-        vmax=vmax,
-        n_contours=n_contours,
-        camera_distance=camera_distance,
-        xlabel=axis_labels[0],
-        ylabel=axis_labels[1],
-        zlabel=axis_labels[2],
-        title=title,
-        figsize=figsize,
-    )
+    view_folders: dict[Optional[str], Path]
+    if preview is not None:
+        render_preview(
+            data,
+            observable_name,
+            frames_folder,
+            mode=preview,
+            vmin=vmin,
+            vmax=vmax,
+            cmap=cmap,
+            frame_format=frame_format,
+            compression_level=png_compression,
+        )
+        view_folders = {None: frames_folder}
+    elif is_sweep:
+        variants = sweep_variants(
+            list(sweep_n_contours) or [n_contours],
+            list(sweep_vmin) or [vmin],
+            list(sweep_vmax) or [vmax],
+            list(sweep_cmap) or [cmap],
+        )
+        sweep_iso_surface(
+            data,
+            observable_name,
+            frames_folder,
+            variants,
+            camera_distance=camera_distance,
+            xlabel=axis_labels[0],
+            ylabel=axis_labels[1],
+            zlabel=axis_labels[2],
+            title=title,
+            figsize=figsize,
+            frame_format=frame_format,
+            compression_level=png_compression,
+        )
+        view_folders = {
+            variant["label"]: frames_folder / variant["label"]
+            for variant in variants
+        }
+    elif orbit is not None:
+        plot_orbit(
+            data[orbit_frame],
+            observable_name,
+            frames_folder,
+            orbit_views(
+                orbit, elevation=orbit_elevation, distance=camera_distance
+            ),
+            vmin=vmin,
+            vmax=vmax,
+            n_contours=n_contours,
+            xlabel=axis_labels[0],
+            ylabel=axis_labels[1],
+            zlabel=axis_labels[2],
+            title=title,
+            figsize=figsize,
+            frame_index=orbit_frame,
+            cmap=cmap,
+            frame_format=frame_format,
+            compression_level=png_compression,
+        )
+        view_folders = {"orbit": frames_folder}
+    else:
+        plot_iso_surface(
+            data,
+            observable_name,
+            frames_folder,
+            vmin=vmin,
+            vmax=vmax,
+            n_contours=n_contours,
+            camera_distance=camera_distance,
+            xlabel=axis_labels[0],
+            ylabel=axis_labels[1],
+            zlabel=axis_labels[2],
+            title=title,
+            figsize=figsize,
+            views=list(views) if views else None,
+            cmap=cmap,
+            frame_format=frame_format,
+            compression_level=png_compression,
+        )
+        if views:
+            view_folders = {
+                f"view_{iv:02d}": frames_folder / f"view_{iv:02d}"
+                for iv in range(len(views))
+            }
+        else:
+            view_folders = {None: frames_folder}
 
-    create_animation(
-        frames_folder,
-        output_folder,
-        observable_name,
-        animation_type,
-        time_slice=time_slice,
-        frame_rate=frame_rate,
-    )
+    if frame_format == "npy":
+        logger.warning(
+            f"Raw npy frames are not encoded. Frames kept in "
+            f"{str(frames_folder)}."
+        )
+        return
+
+    for name_suffix, view_folder in view_folders.items():
+        create_animation(
+            view_folder,
+            output_folder,
+            observable_name,
+            animation_type,
+            time_slice=time_slice,
+            frame_rate=frame_rate,
+            name_suffix=name_suffix,
+            n_jobs=encode_jobs,
+            segment_frames=segment_frames,
+            frame_format=frame_format,
+        )
 
     if not keep_frames:
-        for f in frames_folder.iterdir():
-            f.unlink()
-        frames_folder.rmdir()
+        shutil.rmtree(frames_folder)
         logger.info(f"Removed {str(frames_folder)} and its content.")
@@ -1,4 +1,4 @@
-import subprocess
+import itertools
 from pathlib import Path
 from typing import Optional
 
@@ -7,101 +7,182 @@ import pyvista as pv
 from loguru import logger
 from tqdm import tqdm
 
+from latviz.animation import create_animation  # noqa: F401
+from latviz.mesh_io import write_mesh_sequence
+from latviz.metrics import metrics
+from latviz.writer import FrameWriter
 
-def create_animation(
-    frame_folder: Path,
-    animation_folder: Path,
-    observable: str,
-    animation_type: str,
-    time_slice: Optional[int] = None,
-    frame_rate: Optional[int] = 10,
-) -> None:
+
+def orbit_views(
+    n_views: int,
+    elevation: float = 20.0,
+    distance: float = 1.0,
+    start_azimuth: float = 0.0,
+) -> list[tuple[float, float, float]]:
     """
-    Method for creating animations from generated volumetric figures.
+    Creates camera views evenly spaced on a full orbit around the lattice.
 
     Args:
-        frame_folder: folder path to figures that will be be stitched together.
-        animation_folder: folder path to place animations in.
-        observable: observable we are creating an animation..
-        animation_type: format of animation. Available: 'gif', 'avi' or 'mp4'
-        time_slice: optional, eucl time slice.
-        frame_rate: frames per second of animation.
+        n_views: number of views in the orbit.
+        elevation: elevation angle in degrees above the xy-plane.
+        distance: camera distance scale, see plot_iso_surface.
+        start_azimuth: azimuth angle in degrees of the first view.
+
+    Returns:
+        list of (azimuth, elevation, distance) views.
 
     Raises:
-        NameError: if animation_type is not recognized.
+        ValueError: if n_views is not positive.
     """
+    if n_views < 1:
+        raise ValueError(f"n_views={n_views} must be a positive integer.")
 
-    # Removes spaces
-    observable = observable.replace(" ", "_")
+    azimuths = start_azimuth + np.arange(n_views) * 360.0 / n_views
 
-    input_paths = frame_folder / "frame_t%02d.png"
+    return [(float(az), elevation, distance) for az in azimuths]
 
-    if time_slice:
-        animation_path = animation_folder / (
-            f"{observable.lower()}_{time_slice}.{animation_type}"
-        )
-    else:
-        animation_path = animation_folder / (
-            f"{observable.lower()}.{animation_type}"
-        )
 
-    if animation_type == "gif":
-        cmd = [
-            "convert",
-            "-delay",
-            "1",
-            "-loop",
-            "0",
-            str(frame_folder / "*.png"),
-            str(animation_path),
-        ]
+def _set_camera_view(
+    p: pv.Plotter,
+    default_position: tuple,
+    view: tuple[float, float, float],
+) -> None:
+    """Places the camera at an (azimuth, elevation, distance) view.
 
-    elif animation_type == "mp4":
-        cmd = [
-            "ffmpeg",
-            "-r",
-            str(frame_rate),
-            "-start_number",
-            "0",
-            "-i",
-            str(input_paths),
-            "-c:v",
-            "libx264",
-            "-crf",
-            "0",
-            "-preset",
-            "veryslow",
-            "-c:a",
-            "libmp3lame",
-            "-b:a",
-            "320k",
-            "-y",
-            str(animation_path),
+    The view is measured around the focal point of the default camera
+    position, with the distance scaling the default camera radius.
+    """
+    position, focal_point, _ = default_position
+    azimuth, elevation, distance = view
+
+    radius = np.linalg.norm(np.asarray(position) - np.asarray(focal_point))
+    azimuth, elevation = np.deg2rad(azimuth), np.deg2rad(elevation)
+    direction = np.array(
+        [
+            np.cos(elevation) * np.cos(azimuth),
+            np.cos(elevation) * np.sin(azimuth),
+            np.sin(elevation),
         ]
+    )
 
-    elif animation_type == "avi":
-        cmd = [
-            "ffmpeg",
-            "-r",
-            str(frame_rate),
-            "-i",
-            str(input_paths),
-            "-y",
-            "-qscale:v",
-            "0",
-            str(animation_path),
-        ]
-    else:
-        raise NameError(
-            f"{animation_type} is not a recognized animation type."
-        )
+    p.camera_position = [
+        tuple(np.asarray(focal_point) + radius * distance * direction),
+        focal_point,
+        (0.0, 0.0, 1.0),
+    ]
+
+
+def _point_data(volume: np.ndarray) -> np.ndarray:
+    """Flattens a volume to VTK point data ordering.
+
+    Returns a view of the volume if it is Fortran contiguous, such that VTK
+    can reference the buffer without copying it.
+    """
+    return np.ravel(volume, order="F")
+
+
+def _statistics_text(volume: np.ndarray) -> str:
+    """Summary statistics of a frame, as shown in the figures."""
+    return (
+        f"Avg={volume.mean():8.2e}\n"
+        f"Std={volume.std():8.2e}\n"
+        f"Min={volume.min():8.2e}\n"
+        f"Max={volume.max():8.2e}"
+    )
+
+
+def _set_default_view(p: pv.Plotter, camera_distance: float) -> None:
+    """Moves the camera of a scene to the default view."""
+    pos = list(map(lambda f: f * camera_distance, p.camera.position))
+    p.set_position(pos)
+    p.camera.elevation = -2.5
 
-    logger.info(f"Running command: {' '.join(cmd)}")
 
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-    _ = proc.stdout.read()  # type: ignore[union-attr]
+def _create_scene(
+    grid: pv.UniformGrid,
+    contour: pv.PolyData,
+    statistics: str,
+    it: int,
+    vmin: float,
+    vmax: float,
+    xlabel: Optional[str] = "x",
+    ylabel: Optional[str] = "y",
+    zlabel: Optional[str] = "z",
+    title: Optional["str"] = None,
+    figsize: Optional[tuple[int, int]] = (1280, 1280),
+    cmap: Optional[str] = "plasma",
+    plotter: Optional[pv.Plotter] = None,
+) -> pv.Plotter:
+    """Sets up an off screen plotter with the contours of a single frame.
+
+    If a plotter is provided, its actors are removed and it is reused for
+    the new scene. The lights of the plotter are kept, as these are not
+    recreated once removed.
+    """
 
-    logger.success(f"Animation {animation_path} created.")
+    if plotter is None:
+        p = pv.Plotter(window_size=figsize, off_screen=True)
+        p.enable_anti_aliasing()
+        p.set_background(color="#AFAFAF")
+    else:
+        p = plotter
+        p.clear_actors()
+        if p.scalar_bars:
+            p.remove_scalar_bar()
+
+    outline = grid.outline()
+
+    # Viable color maps:
+    # - viridis
+    # - plasma
+    # - Spectral
+    # - coolwarm
+    #
+    # More color maps seen at:
+    # https://matplotlib.org/stable/tutorials/colors/colormaps.html
+
+    p.add_mesh(outline, color="k")
+    p.add_mesh(
+        contour,
+        clim=[vmin, vmax],
+        cmap=cmap,
+        show_scalar_bar=True,
+        opacity=0.65,
+        scalar_bar_args={
+            "vertical": True,
+            "label_font_size": 20,
+            "title_font_size": 26,
+            "title": "",
+            "font_family": "times",
+            "fmt": "%.2e",
+            "position_y": 0.0125,
+        },
+    )
+    p.show_grid(
+        font_size=26,
+        font_family="times",
+        xlabel=xlabel,
+        ylabel=ylabel,
+        zlabel=zlabel,
+    )
+
+    p.add_text(
+        f"Frame: {it:-02d}",
+        font="times",
+        font_size=14,
+        position="upper_right",
+    )
+    p.add_text(
+        statistics,
+        font="times",
+        position="lower_left",
+        font_size=12,
+    )
+
+    if title:
+        p.add_title(title, font="times")
+
+    return p
 
 
 def plot_iso_surface(
@@ -111,12 +192,16 @@ def plot_iso_surface(
     vmin: Optional[float] = None,
     vmax: Optional[float] = None,
     n_contours: Optional[int] = 20,
-    camera_distance: Optional[float] = 1.0,
+    camera_distance: float = 1.0,
     xlabel: Optional[str] = "x",
     ylabel: Optional[str] = "y",
     zlabel: Optional[str] = "z",
     title: Optional["str"] = None,
     figsize: Optional[tuple[int, int]] = (1280, 1280),
+    views: Optional[list[tuple[float, float, float]]] = None,
+    cmap: Optional[str] = "plasma",
+    frame_format: str = "png",
+    compression_level: int = 6,
 ) -> None:
     """
     Function for creating figures of volumetric surfaces.
@@ -135,11 +220,23 @@ def plot_iso_surface(
         zlabel: z label.
         title: title of figure.
         figsize: shape of figure.
+        views: optional list of (azimuth, elevation, distance) camera views.
+            The contours of each frame are extracted once and rendered from
+            every view, with the frames of view i placed in the sub folder
+            view_{i:02d}. Overrides camera_distance.
+        cmap: name of color map.
+        frame_format: format of the frames. Available: 'png', 'webp' or
+            'npy'. Frames are written by background threads.
+        compression_level: zlib compression level of png frames.
     """
 
     frame_folder.mkdir(exist_ok=True)
     logger.info(f"Folder created at {str(frame_folder)}")
 
+    if views is not None:
+        for iv in range(len(views)):
+            (frame_folder / f"view_{iv:02d}").mkdir(exist_ok=True)
+
     n_frames, n, _, _ = field.shape
 
     if vmin is None:
@@ -155,82 +252,399 @@ def plot_iso_surface(
     contour_list = np.linspace(vmin, vmax, n_contours)
     contour_list = contour_list.tolist()
 
-    for it in tqdm(range(n_frames), desc=f"Rendering {observable_name}"):
+    # A single grid is reused, with the point data replaced for each frame
+    grid = pv.UniformGrid()
+    grid.dimensions = field.shape[1:]
 
-        p = pv.Plotter(window_size=figsize, off_screen=True)
-        p.enable_anti_aliasing()
-        p.set_background(color="#AFAFAF")
+    metrics.start_stage("rendering", total=n_frames * len(views or [None]))
 
-        volume = field[it]
-
-        grid = pv.UniformGrid()
-        grid.dimensions = volume.shape
-
-        grid.point_data["values"] = volume.flatten(order="F")
-        contour = grid.contour(contour_list)
-        outline = grid.outline()
-
-        # Viable color maps:
-        # - viridis
-        # - plasma
-        # - Spectral
-        # - coolwarm
-        #
-        # More color maps seen at:
-        # https://matplotlib.org/stable/tutorials/colors/colormaps.html
-
-        p.add_mesh(outline, color="k")
-        p.add_mesh(
-            contour,
-            clim=[vmin, vmax],
-            cmap="plasma",
-            show_scalar_bar=True,
-            opacity=0.65,
-            scalar_bar_args={
-                "vertical": True,
-                "label_font_size": 20,
-                "title_font_size": 26,
-                "title": "",
-                "font_family": "times",
-                "fmt": "%.2e",
-                "position_y": 0.0125,
-            },
-        )
-        p.show_grid(
-            font_size=26,
-            font_family="times",
-            xlabel=xlabel,
-            ylabel=ylabel,
-            zlabel=zlabel,
-        )
-        pos = list(map(lambda f: f * camera_distance, p.camera.position))
-        p.set_position(pos)
-        p.camera.elevation = -2.5
-
-        p.add_text(
-            f"Frame: {it:-02d}",
-            font="times",
-            font_size=14,
-            position="upper_right",
-        )
-        p.add_text(
-            (
-                f"Avg={volume.mean():8.2e}\n"
-                f"Std={volume.std():8.2e}\n"
-                f"Min={volume.min():8.2e}\n"
-                f"Max={volume.max():8.2e}"
+    with FrameWriter(
+        frame_format, compression_level=compression_level
+    ) as writer:
+        for it in tqdm(range(n_frames), desc=f"Rendering {observable_name}"):
+
+            volume = field[it]
+
+            grid.point_data["values"] = _point_data(volume)
+            contour = grid.contour(contour_list)
+
+            p = _create_scene(
+                grid,
+                contour,
+                _statistics_text(volume),
+                it,
+                vmin,
+                vmax,
+                xlabel=xlabel,
+                ylabel=ylabel,
+                zlabel=zlabel,
+                title=title,
+                figsize=figsize,
+                cmap=cmap,
+            )
+
+            if views is None:
+                _set_default_view(p, camera_distance)
+
+                fpath = writer.write(
+                    p.screenshot(return_img=True),
+                    frame_folder / f"frame_t{it:02d}",
+                )
+
+                tqdm.write(f"file created at {fpath}")
+            else:
+                default_position = p.camera_position
+                for iv, view in enumerate(views):
+                    _set_camera_view(p, default_position, view)
+
+                    writer.write(
+                        p.screenshot(return_img=True),
+                        frame_folder / f"view_{iv:02d}" / f"frame_t{it:02d}",
+                    )
+
+                tqdm.write(f"{len(views)} views created for frame {it}")
+
+            p.close()
+
+    logger.info("Figures created.")
+
+
+def plot_orbit(
+    volume: np.ndarray,
+    observable_name: str,
+    frame_folder: Path,
+    views: list[tuple[float, float, float]],
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    n_contours: Optional[int] = 20,
+    xlabel: Optional[str] = "x",
+    ylabel: Optional[str] = "y",
+    zlabel: Optional[str] = "z",
+    title: Optional["str"] = None,
+    figsize: Optional[tuple[int, int]] = (1280, 1280),
+    frame_index: int = 0,
+    cmap: Optional[str] = "plasma",
+    frame_format: str = "png",
+    compression_level: int = 6,
+) -> None:
+    """
+    Function for creating figures of a single volume seen from several views.
+
+    The contours are extracted once, and the same scene is captured from
+    each view, giving one frame per view.
+
+    Args:
+        volume: field array of size (N,N,N) to plot.
+        observable_name: str of observable_name we are plotting.
+        frame_folder: location of where to temporary store frames.
+        views: list of (azimuth, elevation, distance) camera views, e.g. as
+            created by orbit_views.
+        vmin: float lower cutoff value of the field.
+        vmax: float upper cutoff value of the field.
+        n_contours: optional integer argument for number of contours.
+        xlabel: x label.
+        ylabel: y label.
+        zlabel: z label.
+        title: title of figure.
+        figsize: shape of figure.
+        frame_index: index of the volume in its series, shown in the figure.
+        cmap: name of color map.
+        frame_format: format of the frames. Available: 'png', 'webp' or
+            'npy'. Frames are written by background threads.
+        compression_level: zlib compression level of png frames.
+    """
+
+    frame_folder.mkdir(exist_ok=True)
+    logger.info(f"Folder created at {str(frame_folder)}")
+
+    if vmin is None:
+        vmin = np.min(volume)
+
+    if vmax is None:
+        vmax = np.max(volume)
+
+    if title is None and observable_name != "Observable":
+        title = observable_name
+
+    contour_list = np.linspace(vmin, vmax, n_contours).tolist()
+
+    grid = pv.UniformGrid()
+    grid.dimensions = volume.shape
+
+    grid.point_data["values"] = _point_data(volume)
+    contour = grid.contour(contour_list)
+
+    p = _create_scene(
+        grid,
+        contour,
+        _statistics_text(volume),
+        frame_index,
+        vmin,
+        vmax,
+        xlabel=xlabel,
+        ylabel=ylabel,
+        zlabel=zlabel,
+        title=title,
+        figsize=figsize,
+        cmap=cmap,
+    )
+    default_position = p.camera_position
+
+    metrics.start_stage("rendering", total=len(views))
+
+    with FrameWriter(
+        frame_format, compression_level=compression_level
+    ) as writer:
+        for iv, view in enumerate(
+            tqdm(views, desc=f"Rendering orbit of {observable_name}")
+        ):
+            _set_camera_view(p, default_position, view)
+
+            writer.write(
+                p.screenshot(return_img=True),
+                frame_folder / f"frame_t{iv:02d}",
+            )
+
+    p.close()
+
+    logger.info("Figures created.")
+
+
+def sweep_variants(
+    n_contours: list[int],
+    vmin: list[Optional[float]],
+    vmax: list[Optional[float]],
+    cmap: list[str],
+) -> list[dict]:
+    """
+    Creates the grid of render parameters to sweep over.
+
+    Args:
+        n_contours: numbers of contours.
+        vmin: lower cutoff values of the field. None uses the field minimum.
+        vmax: upper cutoff values of the field. None uses the field maximum.
+        cmap: names of color maps.
+
+    Raises:
+        ValueError: if a parameter value is repeated, such that two variants
+            would be rendered to the same folder.
+
+    Returns:
+        list of variants, each a dict of n_contours, vmin, vmax, cmap and a
+        label identifying the variant.
+    """
+
+    def _label(value: Optional[float]) -> str:
+        if value is None:
+            return "auto"
+
+        # Falls back to the exact representation if the short one is lossy
+        label = f"{value:g}"
+        return label if float(label) == value else repr(float(value))
+
+    variants = [
+        {
+            "n_contours": n_contours_,
+            "vmin": vmin_,
+            "vmax": vmax_,
+            "cmap": cmap_,
+            "label": (
+                f"c{n_contours_}_vmin{_label(vmin_)}_vmax{_label(vmax_)}"
+                f"_{cmap_}"
             ),
-            font="times",
-            position="lower_left",
-            font_size=12,
+        }
+        for n_contours_, vmin_, vmax_, cmap_ in itertools.product(
+            n_contours, vmin, vmax, cmap
         )
+    ]
+
+    labels: list[str] = [str(variant["label"]) for variant in variants]
+    repeated = sorted({label for label in labels if labels.count(label) > 1})
+    if repeated:
+        raise ValueError(f"Repeated sweep parameters: {', '.join(repeated)}")
+
+    return variants
+
+
+def sweep_iso_surface(
+    field: np.ndarray,
+    observable_name: str,
+    frame_folder: Path,
+    variants: list[dict],
+    camera_distance: float = 1.0,
+    xlabel: Optional[str] = "x",
+    ylabel: Optional[str] = "y",
+    zlabel: Optional[str] = "z",
+    title: Optional["str"] = None,
+    figsize: Optional[tuple[int, int]] = (1280, 1280),
+    frame_format: str = "png",
+    compression_level: int = 6,
+) -> None:
+    """
+    Function for creating figures of volumetric surfaces for several render
+    parameters.
+
+    The grid of each frame is built once, and every variant rendered from
+    it. Contours are shared between variants with the same contour levels.
+    The frames of each variant are placed in a sub folder named by the
+    variant label.
+
+    Args:
+        field: field array of size (N,N,N,NT) to plot. The number of
+            points to animate over is always the last dimension.
+        observable_name: str of observable_name we are plotting.
+        frame_folder: location of where to temporary store frames.
+        variants: render parameters, as created by sweep_variants.
+        camera_distance: scalar to multiple camera position by.
+        xlabel: x label.
+        ylabel: y label.
+        zlabel: z label.
+        title: title of figure.
+        figsize: shape of figure.
+        frame_format: format of the frames. Available: 'png', 'webp' or
+            'npy'. Frames are written by background threads.
+        compression_level: zlib compression level of png frames.
+    """
 
-        if title:
-            p.add_title(title, font="times")
+    frame_folder.mkdir(exist_ok=True)
+    logger.info(f"Folder created at {str(frame_folder)}")
 
-        fpath = frame_folder / f"frame_t{it:02d}.png"
-        p.screenshot(fpath, return_img=False)
+    for variant in variants:
+        (frame_folder / variant["label"]).mkdir(exist_ok=True)
 
-        tqdm.write(f"file created at {fpath}")
+    if title is None and observable_name != "Observable":
+        title = observable_name
+
+    field_min, field_max = np.min(field), np.max(field)
+
+    # Sets up the contours and color limits of each variant
+    variant_levels = []
+    for variant in variants:
+        vmin = field_min if variant["vmin"] is None else variant["vmin"]
+        vmax = field_max if variant["vmax"] is None else variant["vmax"]
+        levels = tuple(np.linspace(vmin, vmax, variant["n_contours"]))
+        variant_levels.append((vmin, vmax, levels))
+
+    grid = pv.UniformGrid()
+    grid.dimensions = field.shape[1:]
+
+    metrics.start_stage("rendering", total=field.shape[0] * len(variants))
+
+    # A single plotter is reused for all scenes, with the default camera set
+    # up from the first scene
+    p: Optional[pv.Plotter] = None
+    default_camera = None
+
+    with FrameWriter(
+        frame_format, compression_level=compression_level
+    ) as writer:
+        for it in tqdm(
+            range(field.shape[0]), desc=f"Sweeping {observable_name}"
+        ):
+
+            volume = field[it]
+            statistics = _statistics_text(volume)
+
+            grid.point_data["values"] = _point_data(volume)
+            contours: dict[tuple, pv.PolyData] = {}
+
+            for variant, (vmin, vmax, levels) in zip(variants, variant_levels):
+                if levels not in contours:
+                    contours[levels] = grid.contour(list(levels))
+
+                p = _create_scene(
+                    grid,
+                    contours[levels],
+                    statistics,
+                    it,
+                    vmin,
+                    vmax,
+                    xlabel=xlabel,
+                    ylabel=ylabel,
+                    zlabel=zlabel,
+                    title=title,
+                    figsize=figsize,
+                    cmap=variant["cmap"],
+                    plotter=p,
+                )
+
+                if default_camera is None:
+                    _set_default_view(p, camera_distance)
+                    default_camera = p.camera_position
+                p.camera_position = default_camera
+
+                writer.write(
+                    p.screenshot(return_img=True),
+                    frame_folder / variant["label"] / f"frame_t{it:02d}",
+                )
+
+            tqdm.write(
+                f"{len(variants)} variants from {len(contours)} contours "
+                f"created for frame {it}"
+            )
+
+    if p is not None:
+        p.close()
 
     logger.info("Figures created.")
+
+
+def _contour_arrays(
+    contour: pv.PolyData,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Returns the vertices, triangle faces and scalars of a contour."""
+    if contour.n_points == 0:
+        return np.empty((0, 3)), np.empty((0, 3), dtype=int), np.empty(0)
+
+    contour = contour.triangulate()
+    faces = contour.faces.reshape(-1, 4)[:, 1:]
+
+    return contour.points, faces, contour.point_data["values"]
+
+
+def export_iso_surfaces(
+    field: np.ndarray,
+    observable_name: str,
+    mesh_path: Path,
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    n_contours: Optional[int] = 20,
+) -> None:
+    """
+    Function for exporting the volumetric surfaces as a mesh sequence.
+
+    The contours of each frame are written to a single memory mappable file,
+    which can be read with latviz.mesh_io.MeshSequence. Vertices are in
+    lattice units, and quantized to float16.
+
+    Args:
+        field: field array of size (N,N,N,NT) to export. The number of
+            points to animate over is always the last dimension.
+        observable_name: str of observable_name we are exporting.
+        mesh_path: file path to write the mesh sequence to.
+        vmin: float lower cutoff value of the field.
+        vmax: float upper cutoff value of the field.
+        n_contours: optional integer argument for number of contours.
+    """
+
+    if vmin is None:
+        vmin = np.min(field)
+
+    if vmax is None:
+        vmax = np.max(field)
+
+    contour_list = np.linspace(vmin, vmax, n_contours).tolist()
+
+    grid = pv.UniformGrid()
+    grid.dimensions = field.shape[1:]
+
+    def meshes():
+        for volume in tqdm(field, desc=f"Exporting {observable_name}"):
+            grid.point_data["values"] = _point_data(volume)
+            yield _contour_arrays(grid.contour(contour_list))
+
+    n_frames = write_mesh_sequence(mesh_path, meshes(), clim=(vmin, vmax))
+
+    logger.success(
+        f"Mesh sequence of {n_frames} frames written to {str(mesh_path)}."
+    )
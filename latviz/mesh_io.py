@@ -0,0 +1,136 @@
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+
+MESH_MAGIC = b"LVMESH02"
+
+# Footer of index offset, number of frames, vmin and vmax
+_FOOTER_DTYPE = np.dtype(
+    [("index_offset", "<u8"), ("n_frames", "<u8"), ("clim", "<f8", (2,))]
+)
+
+
+def _padding(offset: int, alignment: int) -> bytes:
+    """Zero bytes needed to align an offset."""
+    return bytes(-offset % alignment)
+
+
+def write_mesh_sequence(
+    path: Path,
+    meshes: Iterable[tuple[np.ndarray, np.ndarray, np.ndarray]],
+    clim: tuple[float, float],
+) -> int:
+    """
+    Writes a sequence of triangle meshes to a single binary file.
+
+    The meshes are written as they are provided, such that only a single
+    mesh needs to be held in memory. Vertices are quantized to float16,
+    scalars stored as float32 to keep the range and precision of the field,
+    and faces stored as uint32. The file layout is,
+
+        magic (8 bytes)
+        per frame: vertices (n_vertices, 3) float16, scalars (n_vertices,)
+            float32, faces (n_faces, 3) uint32
+        index (n_frames, 3) uint64: frame offset, n_vertices, n_faces
+        footer: index offset uint64, n_frames uint64, clim (2,) float64
+
+    Args:
+        path: file path to write the sequence to.
+        meshes: iterable of (vertices, faces, scalars) per frame.
+        clim: (vmin, vmax) color limits of the scalars.
+
+    Returns:
+        number of frames written.
+    """
+    index = []
+
+    with open(path, "wb") as fp:
+        fp.write(MESH_MAGIC)
+
+        for vertices, faces, scalars in meshes:
+            offset = fp.tell()
+
+            fp.write(np.asarray(vertices, dtype="<f2").tobytes())
+            fp.write(_padding(fp.tell(), 4))
+            fp.write(np.asarray(scalars, dtype="<f4").tobytes())
+            fp.write(np.asarray(faces, dtype="<u4").tobytes())
+            fp.write(_padding(fp.tell(), 8))
+
+            index.append((offset, len(vertices), len(faces)))
+
+        index_offset = fp.tell()
+        fp.write(np.asarray(index, dtype="<u8").reshape(-1, 3).tobytes())
+
+        footer = np.zeros(1, dtype=_FOOTER_DTYPE)
+        footer["index_offset"] = index_offset
+        footer["n_frames"] = len(index)
+        footer["clim"] = clim
+        fp.write(footer.tobytes())
+
+    return len(index)
+
+
+class MeshSequence:
+    """
+    Memory mapped reader of mesh sequences written by write_mesh_sequence.
+
+    Frames are read lazily, such that any frame can be accessed directly
+    without reading the preceding frames.
+
+    Args:
+        path: file path of the mesh sequence.
+
+    Raises:
+        ValueError: if the file is not a mesh sequence.
+    """
+
+    def __init__(self, path: Path):
+        self._data = np.memmap(path, dtype=np.uint8, mode="r")
+
+        if bytes(self._data[: len(MESH_MAGIC)]) != MESH_MAGIC:
+            raise ValueError(f"{str(path)} is not a LatViz mesh sequence.")
+
+        footer = self._data[-_FOOTER_DTYPE.itemsize:].view(_FOOTER_DTYPE)[0]
+        self.clim = tuple(footer["clim"])
+
+        index_offset = int(footer["index_offset"])
+        n_frames = int(footer["n_frames"])
+        self._index = (
+            self._data[index_offset: index_offset + n_frames * 3 * 8]
+            .view("<u8")
+            .reshape(n_frames, 3)
+        )
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(
+        self, it: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the (vertices, faces, scalars) of a frame.
+
+        Vertices are of shape (n_vertices, 3) and faces of shape (n_faces, 3)
+        holding vertex indices of each triangle.
+        """
+        if not -len(self) <= it < len(self):
+            raise IndexError(f"frame {it} out of range for {len(self)} frames")
+
+        offset, n_vertices, n_faces = (int(i) for i in self._index[it])
+
+        vertices_end = offset + n_vertices * 3 * 2
+        scalars_offset = vertices_end + len(_padding(vertices_end, 4))
+        faces_offset = scalars_offset + n_vertices * 4
+
+        vertices = (
+            self._data[offset:vertices_end].view("<f2").reshape(n_vertices, 3)
+        )
+        scalars = self._data[scalars_offset:faces_offset].view("<f4")
+        faces = (
+            self._data[faces_offset: faces_offset + n_faces * 3 * 4]
+            .view("<u4")
+            .reshape(n_faces, 3)
+        )
+
+        return vertices, faces, scalars
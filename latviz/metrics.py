@@ -0,0 +1,203 @@
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+
+def resident_memory() -> Optional[int]:
+    """Resident memory of the process in bytes, if available from /proc."""
+    try:
+        with open("/proc/self/statm") as fp:
+            return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_resident_memory() -> Optional[int]:
+    """Peak resident memory of the process in bytes, if available."""
+    try:
+        # Imported here, as the module is not available on Windows
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+    if sys.platform == "darwin":
+        return max_rss
+    return max_rss * 1024
+
+
+class Metrics:
+    """
+    Live throughput metrics of a render job.
+
+    Counters and gauges are updated by the loading, rendering, writing and
+    encoding stages, and periodically written by a background thread to a
+    status file. Files ending in .prom are written in the Prometheus textfile
+    format, all other files as JSON. Files are replaced atomically, such that
+    readers never see a partially written file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, float] = {}
+        self._gauges: dict[str, float] = {}
+
+        self._stage = "idle"
+        self._stage_total: Optional[int] = None
+        self._stage_done = 0
+        self._stage_start = time.monotonic()
+        self._start = time.monotonic()
+
+        self._path: Optional[Path] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Increments a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Sets a gauge, e.g. a queue depth."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def start_stage(self, stage: str, total: Optional[int] = None) -> None:
+        """
+        Starts a stage of the job, resetting the stage progress.
+
+        Args:
+            stage: name of the stage, e.g. 'rendering'.
+            total: optional, number of steps in the stage. Used to estimate
+                the time remaining.
+        """
+        with self._lock:
+            self._stage = stage
+            self._stage_total = total
+            self._stage_done = 0
+            self._stage_start = time.monotonic()
+
+    def advance(self, steps: int = 1) -> None:
+        """Advances the progress of the current stage."""
+        with self._lock:
+            self._stage_done += steps
+
+    def snapshot(self) -> dict:
+        """Returns the current metrics."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._stage_start
+            rate = self._stage_done / elapsed if elapsed > 0 else 0.0
+
+            eta = None
+            if self._stage_total is not None and rate > 0:
+                eta = (self._stage_total - self._stage_done) / rate
+
+            return {
+                "timestamp": time.time(),
+                "uptime_seconds": now - self._start,
+                "stage": self._stage,
+                "stage_done": self._stage_done,
+                "stage_total": self._stage_total,
+                "stage_rate": rate,
+                "stage_eta_seconds": eta,
+                "resident_memory_bytes": resident_memory(),
+                "peak_resident_memory_bytes": peak_resident_memory(),
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+            }
+
+    def _format_prometheus(self, snapshot: dict) -> str:
+        """Formats a snapshot in the Prometheus text exposition format."""
+        lines = [
+            "# TYPE latviz_stage_info gauge",
+            f'latviz_stage_info{{stage="{snapshot["stage"]}"}} 1',
+        ]
+
+        values = {
+            "uptime_seconds": snapshot["uptime_seconds"],
+            "stage_done": snapshot["stage_done"],
+            "stage_total": snapshot["stage_total"],
+            "stage_rate": snapshot["stage_rate"],
+            "stage_eta_seconds": snapshot["stage_eta_seconds"],
+            "resident_memory_bytes": snapshot["resident_memory_bytes"],
+            "peak_resident_memory_bytes": snapshot[
+                "peak_resident_memory_bytes"
+            ],
+            **snapshot["gauges"],
+        }
+        for name, value in values.items():
+            if value is not None:
+                lines += [
+                    f"# TYPE latviz_{name} gauge",
+                    f"latviz_{name} {value}",
+                ]
+
+        for name, value in snapshot["counters"].items():
+            lines += [
+                f"# TYPE latviz_{name}_total counter",
+                f"latviz_{name}_total {value}",
+            ]
+
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Writes the current metrics to the status file."""
+        if self._path is None:
+            return
+
+        snapshot = self.snapshot()
+        if self._path.suffix == ".prom":
+            content = self._format_prometheus(snapshot)
+        else:
+            content = json.dumps(snapshot, indent=2)
+
+        tmp_path = self._path.with_name(f".{self._path.name}.tmp")
+        try:
+            tmp_path.write_text(content)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self._path}: {e}")
+
+    def _report(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.write()
+
+    def start(self, path: Path, interval: float = 10.0) -> None:
+        """
+        Starts writing the metrics periodically to a status file.
+
+        Args:
+            path: status file. Files ending in .prom are written in the
+                Prometheus textfile format, others as JSON.
+            interval: seconds between each write.
+        """
+        self.stop()
+
+        self._path = path
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._report, args=(interval,), daemon=True
+        )
+        self._thread.start()
+        self.write()
+
+    def stop(self) -> None:
+        """Stops the periodic writing, and writes the final metrics."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.write()
+
+
+# Metrics of the running process, updated by all stages
+metrics = Metrics()
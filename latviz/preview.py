@@ -0,0 +1,190 @@
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+from matplotlib import colormaps
+from tqdm import tqdm
+
+from latviz.metrics import metrics
+from latviz.writer import FrameWriter
+
+PREVIEW_MODES = ("slices", "mip")
+
+
+def colormap_lut(cmap: str = "plasma", n_colors: int = 256) -> np.ndarray:
+    """
+    Creates a color lookup table.
+
+    Args:
+        cmap: name of a matplotlib color map.
+        n_colors: number of colors in the table.
+
+    Returns:
+        array of shape (n_colors, 3) of uint8 RGB colors.
+    """
+    colors = colormaps[cmap](np.linspace(0, 1, n_colors))[:, :3]
+    return np.round(colors * 255).astype(np.uint8)
+
+
+def _panels(field: np.ndarray, mode: str) -> list[np.ndarray]:
+    """
+    Extracts the three orthogonal panels of each frame.
+
+    Args:
+        field: field array of size (NT,N,N,N), indexed as (t, x, y, z).
+        mode: 'slices' for the mid-planes, or 'mip' for the maximum
+            intensity projections.
+
+    Returns:
+        the xy, xz and yz panels, each of shape (NT, rows, columns).
+    """
+    if mode == "slices":
+        _, nx, ny, nz = field.shape
+        xy = field[:, :, :, nz // 2]
+        xz = field[:, :, ny // 2, :]
+        yz = field[:, nx // 2, :, :]
+    elif mode == "mip":
+        xy = field.max(axis=3)
+        xz = field.max(axis=2)
+        yz = field.max(axis=1)
+    else:
+        raise NameError(f"{mode} is not a recognized preview mode.")
+
+    # Transposes such that rows are the second axis of each plane, with the
+    # origin in the lower left corner.
+    return [panel.transpose(0, 2, 1)[:, ::-1, :] for panel in (xy, xz, yz)]
+
+
+def preview_frames(
+    field: np.ndarray,
+    mode: str = "slices",
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    cmap: str = "plasma",
+    scale: Optional[int] = None,
+    chunk_size: int = 64,
+) -> Iterator[np.ndarray]:
+    """
+    Creates preview images of the frames with NumPy only.
+
+    The three orthogonal panels of each frame are color mapped through a
+    lookup table and tiled side by side. Frames are processed in chunks,
+    vectorized over the frames of each chunk.
+
+    Args:
+        field: field array of size (NT,N,N,N) to preview, with the axis to
+            animate over as the first axis.
+        mode: 'slices' for the orthogonal mid-planes, or 'mip' for the
+            maximum intensity projections.
+        vmin: float lower cutoff value of the field.
+        vmax: float upper cutoff value of the field.
+        cmap: name of color map.
+        scale: integer upscaling of each lattice point. Defaults to a panel
+            height of at least 256 pixels.
+        chunk_size: number of frames processed at once.
+
+    Raises:
+        NameError: if mode is not recognized.
+
+    Yields:
+        uint8 RGB images of shape (height, width, 3), with even dimensions
+        as required by most video encoders.
+    """
+    if mode not in PREVIEW_MODES:
+        raise NameError(f"{mode} is not a recognized preview mode.")
+
+    if vmin is None:
+        vmin = np.min(field)
+
+    if vmax is None:
+        vmax = np.max(field)
+
+    n = field.shape[1]
+    if scale is None:
+        scale = max(1, -(-256 // n))
+
+    lut = colormap_lut(cmap)
+    gap = 2
+
+    for start in range(0, field.shape[0], chunk_size):
+        panels = _panels(field[start: start + chunk_size], mode)
+        n_chunk, rows, _ = panels[0].shape
+
+        # Tiles the panels with a gap of the lowest color between them
+        separator = np.full((n_chunk, rows, gap), vmin)
+        tiled = np.concatenate(
+            [panels[0], separator, panels[1], separator, panels[2]], axis=2
+        )
+
+        if vmax > vmin:
+            scaled = (tiled - vmin) / (vmax - vmin)
+        else:
+            scaled = np.zeros_like(tiled)
+        indices = np.clip(scaled * (len(lut) - 1), 0, len(lut) - 1)
+        images = lut[np.rint(indices).astype(np.intp)]
+
+        images = images.repeat(scale, axis=1).repeat(scale, axis=2)
+
+        # Pads to even dimensions
+        height, width = images.shape[1:3]
+        images = np.pad(
+            images, ((0, 0), (0, height % 2), (0, width % 2), (0, 0))
+        )
+
+        yield from images
+
+
+def render_preview(
+    field: np.ndarray,
+    observable_name: str,
+    frame_folder: Path,
+    mode: str = "slices",
+    vmin: Optional[float] = None,
+    vmax: Optional[float] = None,
+    cmap: str = "plasma",
+    scale: Optional[int] = None,
+    frame_format: str = "png",
+    compression_level: int = 6,
+) -> None:
+    """
+    Function for creating preview frames without rendering the volume.
+
+    Args:
+        field: field array of size (NT,N,N,N) to preview, with the axis to
+            animate over as the first axis.
+        observable_name: str of observable_name we are previewing.
+        frame_folder: location of where to temporary store frames.
+        mode: 'slices' for the orthogonal mid-planes, or 'mip' for the
+            maximum intensity projections.
+        vmin: float lower cutoff value of the field.
+        vmax: float upper cutoff value of the field.
+        cmap: name of color map.
+        scale: integer upscaling of each lattice point.
+        frame_format: format of the frames. Available: 'png', 'webp' or
+            'npy'. Frames are written by background threads.
+        compression_level: zlib compression level of png frames.
+    """
+
+    frame_folder.mkdir(exist_ok=True)
+    logger.info(f"Folder created at {str(frame_folder)}")
+
+    metrics.start_stage("rendering", total=field.shape[0])
+
+    with FrameWriter(
+        frame_format, compression_level=compression_level
+    ) as writer:
+        frames = preview_frames(
+            field, mode=mode, vmin=vmin, vmax=vmax, cmap=cmap, scale=scale
+        )
+        for it, image in enumerate(
+            tqdm(
+                frames,
+                total=field.shape[0],
+                desc=f"Previewing {observable_name}",
+            )
+        ):
+            writer.write(image, frame_folder / f"frame_t{it:02d}")
+
+    logger.info("Figures created.")
@@ -0,0 +1,370 @@
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pyvista as pv
+from loguru import logger
+from tqdm import tqdm
+
+from latviz.animation import create_animation
+from latviz.catalog import build_catalog
+from latviz.latviz import (
+    _create_scene,
+    _point_data,
+    _set_camera_view,
+    _set_default_view,
+    _statistics_text,
+)
+from latviz.metrics import metrics
+from latviz.utils import _check_load_arguments, load_fields, memmap_field
+from latviz.writer import FrameWriter
+
+# Parameters that change the contours, and the ones that require a new plotter
+_CONTOUR_PARAMS = {"vmin", "vmax", "n_contours"}
+_PLOTTER_PARAMS = {"figsize", "camera_distance"}
+
+_RENDER_PARAMS = {
+    "observable_name",
+    "cmap",
+    "xlabel",
+    "ylabel",
+    "zlabel",
+    "title",
+    *_CONTOUR_PARAMS,
+    *_PLOTTER_PARAMS,
+}
+
+
+class LatViz:
+    """
+    Rendering session holding a field and the state needed to render it.
+
+    The field, its statistics, the grid, the plotter and the extracted
+    contours are kept between calls, such that single frames can be rendered,
+    or re-rendered after a parameter change, without setting up the pipeline
+    from scratch.
+
+    Args:
+        field: field array of size (NT,N,N,N), with the axis to animate over
+            as the first axis.
+        observable_name: name of the observable we are rendering.
+        vmin: float lower cutoff value of the field. Defaults to the field
+            minimum.
+        vmax: float upper cutoff value of the field. Defaults to the field
+            maximum.
+        n_contours: number of contours.
+        cmap: name of color map.
+        camera_distance: scalar to multiple camera position by.
+        xlabel: x label.
+        ylabel: y label.
+        zlabel: z label.
+        title: title of figure. No title will default to observable name.
+        figsize: shape of figure.
+        time_slice: optional, eucl time slice the field was selected at.
+        contour_cache_size: number of extracted contours to keep.
+
+    Example:
+        >>> with LatViz.from_files(["field.bin"], n=32, nt=64) as session:
+        ...     image = session.render_frame(10)
+        ...     session.set_params(cmap="viridis")
+        ...     session.render_all(Path("frames"))
+        ...     session.encode(Path("frames"), Path("."), "mp4")
+    """
+
+    def __init__(
+        self,
+        field: np.ndarray,
+        observable_name: str = "Observable",
+        vmin: Optional[float] = None,
+        vmax: Optional[float] = None,
+        n_contours: int = 20,
+        cmap: str = "plasma",
+        camera_distance: float = 1.0,
+        xlabel: str = "x",
+        ylabel: str = "y",
+        zlabel: str = "z",
+        title: Optional[str] = None,
+        figsize: tuple[int, int] = (1280, 1280),
+        time_slice: Optional[int] = None,
+        contour_cache_size: int = 32,
+    ):
+        self.field = field
+        self.observable_name = observable_name
+        self.vmin = vmin
+        self.vmax = vmax
+        self.n_contours = n_contours
+        self.cmap = cmap
+        self.camera_distance = camera_distance
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.zlabel = zlabel
+        self.title = title
+        self.figsize = figsize
+        self.time_slice = time_slice
+        self.contour_cache_size = contour_cache_size
+
+        self.field_min = float(np.min(field))
+        self.field_max = float(np.max(field))
+
+        self._statistics: dict[int, str] = {}
+        self._contours: OrderedDict[tuple, pv.PolyData] = OrderedDict()
+
+        self._grid = pv.UniformGrid()
+        self._grid.dimensions = field.shape[1:]
+        self._grid_frame: Optional[int] = None
+
+        self._plotter: Optional[pv.Plotter] = None
+        self._scene_camera: Optional[tuple] = None
+        self._default_camera: Optional[tuple] = None
+
+    @classmethod
+    def from_files(
+        cls,
+        field_inputs: Iterable[str],
+        n: int,
+        nt: int,
+        time_slice: Optional[int] = None,
+        time_range: Optional[tuple[int, int]] = None,
+        transforms: Optional[
+            list[Callable[[Iterable[np.ndarray]], Iterator[np.ndarray]]]
+        ] = None,
+        use_cache: bool = True,
+        **kwargs,
+    ) -> "LatViz":
+        """
+        Opens a session from configuration files.
+
+        A single configuration without transforms is memory mapped, such
+        that time slices are only read from file when they are rendered.
+
+        Args:
+            field_inputs: file paths, directories or glob patterns.
+            n: spatial points.
+            nt: temporal points.
+            time_slice: time slice to render of multiple configurations.
+            time_range: range [start, stop) of time slices to average over
+                of multiple configurations.
+            transforms: frame transforms, see latviz.transforms.
+            use_cache: if true, uses the cached file catalog.
+            **kwargs: render parameters passed on to LatViz.
+        """
+        field_paths = build_catalog(field_inputs, n, nt, use_cache=use_cache)
+
+        if len(field_paths) == 1 and not transforms:
+            _check_load_arguments(field_paths, nt, time_slice, time_range)
+            field = memmap_field(field_paths[0], n, nt)
+        else:
+            field = load_fields(
+                field_paths,
+                n,
+                nt,
+                time_slice=time_slice,
+                time_range=time_range,
+                transforms=transforms,
+            )
+
+        return cls(field, time_slice=time_slice, **kwargs)
+
+    def __enter__(self) -> "LatViz":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.field.shape[0]
+
+    @property
+    def clim(self) -> tuple[float, float]:
+        """Contour limits, with the field extremes used as defaults."""
+        vmin = self.field_min if self.vmin is None else self.vmin
+        vmax = self.field_max if self.vmax is None else self.vmax
+        return vmin, vmax
+
+    def set_params(self, **params) -> None:
+        """
+        Updates render parameters, invalidating only the affected caches.
+
+        Args:
+            **params: render parameters, as accepted by LatViz.
+
+        Raises:
+            TypeError: if a parameter is not a render parameter.
+        """
+        unknown = set(params) - _RENDER_PARAMS
+        if unknown:
+            raise TypeError(
+                f"Unknown render parameter(s): {', '.join(sorted(unknown))}"
+            )
+
+        for name, value in params.items():
+            setattr(self, name, value)
+
+        if _PLOTTER_PARAMS & set(params):
+            self._close_plotter()
+
+    def statistics(self, it: int) -> str:
+        """Summary statistics of a frame, computed once per frame."""
+        if it not in self._statistics:
+            self._statistics[it] = _statistics_text(self.field[it])
+
+        return self._statistics[it]
+
+    def contour(self, it: int) -> pv.PolyData:
+        """Contours of a frame at the current contour levels."""
+        vmin, vmax = self.clim
+        key = (it, tuple(np.linspace(vmin, vmax, self.n_contours)))
+
+        if key in self._contours:
+            self._contours.move_to_end(key)
+            return self._contours[key]
+
+        if self._grid_frame != it:
+            self._grid.point_data["values"] = _point_data(self.field[it])
+            self._grid_frame = it
+
+        contour = self._grid.contour(list(key[1]))
+
+        self._contours[key] = contour
+        if len(self._contours) > self.contour_cache_size:
+            self._contours.popitem(last=False)
+
+        return contour
+
+    def _close_plotter(self) -> None:
+        if self._plotter is not None:
+            self._plotter.close()
+        self._plotter = None
+        self._scene_camera = None
+        self._default_camera = None
+
+    def _render(
+        self, it: int, view: Optional[tuple[float, float, float]] = None
+    ) -> np.ndarray:
+        """Renders a frame with the reusable plotter."""
+        title = self.title
+        if title is None and self.observable_name != "Observable":
+            title = self.observable_name
+
+        vmin, vmax = self.clim
+
+        self._plotter = _create_scene(
+            self._grid,
+            self.contour(it),
+            self.statistics(it),
+            it,
+            vmin,
+            vmax,
+            xlabel=self.xlabel,
+            ylabel=self.ylabel,
+            zlabel=self.zlabel,
+            title=title,
+            figsize=self.figsize,
+            cmap=self.cmap,
+            plotter=self._plotter,
+        )
+
+        # The cameras are set up from the first scene, and then reused
+        if self._scene_camera is None:
+            self._scene_camera = self._plotter.camera_position
+            _set_default_view(self._plotter, self.camera_distance)
+            self._default_camera = self._plotter.camera_position
+
+        if view is None:
+            self._plotter.camera_position = self._default_camera
+        else:
+            _set_camera_view(self._plotter, tuple(self._scene_camera), view)
+
+        return self._plotter.screenshot(return_img=True)
+
+    def render_frame(
+        self, it: int, view: Optional[tuple[float, float, float]] = None
+    ) -> np.ndarray:
+        """
+        Renders a single frame.
+
+        Args:
+            it: index of the frame.
+            view: optional (azimuth, elevation, distance) camera view.
+
+        Returns:
+            image array of shape (height, width, 3).
+        """
+        return self._render(it, view=view)
+
+    def render_all(
+        self,
+        frame_folder: Path,
+        view: Optional[tuple[float, float, float]] = None,
+        frame_format: str = "png",
+        compression_level: int = 6,
+    ) -> None:
+        """
+        Renders all frames to a folder, as expected by encode.
+
+        Args:
+            frame_folder: location of where to store frames.
+            view: optional (azimuth, elevation, distance) camera view.
+            frame_format: format of the frames. Available: 'png', 'webp' or
+                'npy'. Frames are written by background threads.
+            compression_level: zlib compression level of png frames.
+        """
+        frame_folder.mkdir(exist_ok=True)
+
+        metrics.start_stage("rendering", total=len(self))
+
+        with FrameWriter(
+            frame_format, compression_level=compression_level
+        ) as writer:
+            for it in tqdm(
+                range(len(self)), desc=f"Rendering {self.observable_name}"
+            ):
+                writer.write(
+                    self._render(it, view=view),
+                    frame_folder / f"frame_t{it:02d}",
+                )
+
+        logger.info("Figures created.")
+
+    def encode(
+        self,
+        frame_folder: Path,
+        animation_folder: Path,
+        animation_type: str = "avi",
+        frame_rate: int = 10,
+        name_suffix: Optional[str] = None,
+        n_jobs: int = 1,
+        frame_format: str = "png",
+    ) -> None:
+        """
+        Creates an animation from frames rendered by render_all.
+
+        Args:
+            frame_folder: folder path of the rendered frames.
+            animation_folder: folder path to place animation in.
+            animation_type: format of animation. Available: 'gif', 'avi' or
+                'mp4'.
+            frame_rate: frames per second of animation.
+            name_suffix: optional suffix appended to the animation name.
+            n_jobs: number of parallel ffmpeg processes.
+            frame_format: format of the rendered frames.
+        """
+        create_animation(
+            frame_folder,
+            animation_folder,
+            self.observable_name,
+            animation_type,
+            time_slice=self.time_slice,
+            frame_rate=frame_rate,
+            name_suffix=name_suffix,
+            n_jobs=n_jobs,
+            frame_format=frame_format,
+        )
+
+    def close(self) -> None:
+        """Closes the plotter, and clears the caches."""
+        self._close_plotter()
+        self._contours.clear()
+        self._statistics.clear()
@@ -0,0 +1,176 @@
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+
+import numpy as np
+
+
+def absolute(frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """Takes the absolute value |field| of each frame."""
+    for frame in frames:
+        yield np.abs(frame)
+
+
+def square(frames: Iterable[np.ndarray]) -> Iterator[np.ndarray]:
+    """Squares each frame."""
+    for frame in frames:
+        yield np.square(frame)
+
+
+def rolling_mean(
+    frames: Iterable[np.ndarray], window: int
+) -> Iterator[np.ndarray]:
+    """
+    Rolling average over consecutive frames.
+
+    Each output frame is the average of the current frame and the
+    window - 1 preceding frames. The first frames are averaged over the
+    frames available so far, such that the number of frames is preserved.
+    Only the frames in the window are held in memory.
+
+    Args:
+        frames: frames of shape (N,N,N).
+        window: number of frames to average over.
+
+    Raises:
+        ValueError: if window is not positive.
+    """
+    if window < 1:
+        raise ValueError(f"window={window} must be a positive integer.")
+
+    buffer: deque[np.ndarray] = deque(maxlen=window)
+
+    # The mean is recomputed from the window, as a running sum accumulates
+    # cancellation errors over long series
+    for frame in frames:
+        buffer.append(frame)
+        yield np.mean(buffer, axis=0)
+
+
+def _wrapped_gaussian(n: int, sigma: float) -> np.ndarray:
+    """Normalized Gaussian sampled on a periodic lattice of n points."""
+    if sigma == 0:
+        return np.eye(1, n).ravel()
+
+    # Sums the periodic images within 5 sigma of each lattice point
+    n_images = int(np.ceil(5 * sigma / n))
+    x = np.arange(n) - n * np.arange(-n_images, n_images + 1)[:, None]
+    g = np.exp(-0.5 * (x / sigma) ** 2).sum(axis=0)
+
+    return g / g.sum()
+
+
+def _gaussian_kernel(shape: tuple[int, ...], sigma: float) -> np.ndarray:
+    """
+    Fourier transform of a periodic Gaussian, as used by rfftn.
+
+    The Gaussian is sampled on the lattice in real space, such that the
+    kernel is non-negative and normalized.
+    """
+    kernel = np.ones(1)
+    for i, n in enumerate(shape):
+        g = _wrapped_gaussian(n, sigma)
+        if i == len(shape) - 1:
+            g_k = np.fft.rfft(g)
+        else:
+            g_k = np.fft.fft(g)
+
+        # The kernel is symmetric, such that its transform is real
+        kernel = np.multiply.outer(kernel, g_k.real)
+
+    return kernel.reshape(kernel.shape[1:])
+
+
+def gaussian_smooth(
+    frames: Iterable[np.ndarray], sigma: float
+) -> Iterator[np.ndarray]:
+    """
+    Gaussian spatial smoothing with periodic boundaries.
+
+    The frames are convolved with a Gaussian sampled on the periodic
+    lattice, preserving the mean and the sign of non-negative fields. The
+    convolution is performed in Fourier space.
+
+    Args:
+        frames: frames of shape (N,N,N).
+        sigma: standard deviation of the Gaussian, in lattice units.
+
+    Raises:
+        ValueError: if sigma is negative.
+    """
+    if sigma < 0:
+        raise ValueError(f"sigma={sigma} must be non-negative.")
+
+    kernel = None
+
+    for frame in frames:
+        if kernel is None:
+            kernel = _gaussian_kernel(frame.shape, sigma)
+
+        axes = tuple(range(frame.ndim))
+        yield np.fft.irfftn(
+            np.fft.rfftn(frame, axes=axes) * kernel, s=frame.shape, axes=axes
+        )
+
+
+TRANSFORMS: dict[str, Callable[..., Iterator[np.ndarray]]] = {
+    "abs": absolute,
+    "square": square,
+    "rolling": rolling_mean,
+    "smooth": gaussian_smooth,
+}
+
+
+def parse_transform(
+    spec: str,
+) -> Callable[[Iterable[np.ndarray]], Iterator[np.ndarray]]:
+    """
+    Creates a transform from a specification on the form name[:argument].
+
+    Available transforms are,
+        abs: absolute value of the field.
+        square: field squared.
+        rolling:WINDOW: rolling average over WINDOW frames.
+        smooth:SIGMA: periodic Gaussian smoothing with width SIGMA.
+
+    Args:
+        spec: transform specification, e.g. 'smooth:1.5'.
+
+    Raises:
+        ValueError: if the transform is not recognized, or its argument is
+            missing, invalid or not expected.
+    """
+    name, separator, argument = spec.partition(":")
+
+    if name not in TRANSFORMS:
+        raise ValueError(
+            f"{name} is not a recognized transform. Available: "
+            f"{', '.join(TRANSFORMS)}"
+        )
+
+    if name not in ("rolling", "smooth"):
+        if separator:
+            raise ValueError(f"Transform {name} does not take an argument.")
+        return TRANSFORMS[name]
+
+    if not argument:
+        raise ValueError(f"Transform {name} requires an argument, {name}:X.")
+
+    try:
+        if name == "rolling":
+            window = int(argument)
+        else:
+            sigma = float(argument)
+    except ValueError:
+        raise ValueError(
+            f"{argument} is not a valid argument of transform {name}."
+        )
+
+    if name == "rolling":
+        if window < 1:
+            raise ValueError(f"window={window} must be a positive integer.")
+        return partial(rolling_mean, window=window)
+    else:
+        if sigma < 0:
+            raise ValueError(f"sigma={sigma} must be non-negative.")
+        return partial(gaussian_smooth, sigma=sigma)
@@ -1,4 +1,5 @@
 import re
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 from typing import Optional
 
@@ -6,12 +7,15 @@ import numpy as np
 from loguru import logger
 from tqdm import tqdm
 
+from latviz.metrics import metrics
+
 
 def load_field_from_file(
     file: Path,
     n: int,
     nt: int,
     euclidean_time: Optional[int] = None,
+    euclidean_time_range: Optional[tuple[int, int]] = None,
 ) -> np.ndarray:
     """
     Loads field from file.
@@ -22,9 +26,29 @@ def load_field_from_file(
         nt (int): temporal time.
         euclidean_time (Optional[int], optional): what Euclidean time slice
             to look at. Default is retrieving all Euclidean time slices.
+        euclidean_time_range (Optional[tuple[int, int]], optional): range
+            [start, stop) of Euclidean time slices to average over. Cannot
+            be combined with euclidean_time.
     """
-    if euclidean_time is None:
-        return np.fromfile(file, dtype=float).reshape((n, n, n, nt), order="F")
+    if euclidean_time_range is not None:
+
+        # Loads the contiguous block of time slices, and averages over it
+        start, stop = euclidean_time_range
+        block_size = n ** 3 * 8  # 8 is bytes
+
+        with open(file, "rb") as fp:
+            fp.seek(start * block_size)
+            block = fp.read((stop - start) * block_size)
+            block = np.frombuffer(block, dtype=np.double)
+
+        metrics.increment("bytes_read", block.nbytes)
+
+        return block.reshape((n, n, n, stop - start), order="F").mean(axis=-1)
+
+    elif euclidean_time is None:
+        data = np.fromfile(file, dtype=float)
+        metrics.increment("bytes_read", data.nbytes)
+        return data.reshape((n, n, n, nt), order="F")
     else:
 
         # Loads euclidean time
@@ -36,49 +60,72 @@ def load_field_from_file(
             block = fp.read(block_size)
             block = np.frombuffer(block, dtype=np.double)
 
+        metrics.increment("bytes_read", block.nbytes)
         return np.array(block).reshape((n, n, n), order="F")
 
 
+def memmap_field(file: Path, n: int, nt: int) -> np.ndarray:
+    """
+    Memory maps a field from file.
+
+    Args:
+        file (Path): path to .bin file containing lattice data.
+        n (int): spatial points.
+        nt (int): temporal points.
+
+    Returns:
+        read-only hypercube of shape (nt, n, n, n) with the Euclidean time as
+        the first axis. Each time slice is a Fortran contiguous view, read
+        from file when accessed.
+    """
+    data = np.memmap(file, dtype=float, mode="r", shape=(n ** 3 * nt,))
+    return np.moveaxis(data.reshape((n, n, n, nt), order="F"), -1, 0)
+
+
+def natural_sort_key(name: str) -> list:
+    """Sort key ordering numbers in names by value, e.g. 'a9' before 'a10'."""
+    return [
+        int(part) if part.isdigit() else part.lower()
+        for part in re.split(r"(\d+)", name)
+    ]
+
+
 def _check_file_sorting(observable_config_path: list[Path]) -> None:
     """Checks the order of input files."""
-    _names = list(map(lambda f: f.name, observable_config_path))
-    _names_sorted = list(
-        sorted(_names, key=lambda f: re.findall(r"(\d+).bin", f)[0])
-    )
+    # Sorted on the full paths, as the file catalog is
+    _names = list(map(str, observable_config_path))
+    _names_sorted = list(sorted(_names, key=natural_sort_key))
     _is_match = [f0 == f1 for f0, f1 in zip(_names, _names_sorted)]
     if sum(_is_match) != len(_is_match):
         logger.warning("Possible unsorted input files detected. Continuing.")
 
 
-def load_fields(
+def _check_load_arguments(
     observable_config_path: list[Path],
-    n: int,
     nt: int,
     time_slice: Optional[int] = None,
-) -> np.ndarray:
-    """Load data from provided path(s).
-
-    Assumes a input configurations is a hypercube of shape (n, n, n, nt) on
-    fortran ordering, i.e. column-major ordering.
+    time_range: Optional[tuple[int, int]] = None,
+) -> None:
+    """Checks the arguments of load_fields and iter_fields."""
 
-    Args:
-        observable_config_path (list(Path)): List of paths containing
-            observable(s) of configurations.
-        n (int): spatial points.
-        nt (int): temporal points.
-        time_slice (Optional[int], optional): time slice to render.
-
-    Raises:
-        ValueError: if selected time slice exceeds temporal dimension.
+    if time_slice is not None and time_range is not None:
+        raise ValueError(
+            f"Cannot select both a time slice(={time_slice}) and a time "
+            f"range(={time_range})."
+        )
 
-    Returns:
-        hypercube with the axis to animate over as the first axis.
-    """
+    if time_range is not None and not (
+        0 <= time_range[0] < time_range[1] <= nt
+    ):
+        raise ValueError(
+            f"time_range={time_range} is not a non-empty range within the"
+            f" temporal dimension nt={nt}"
+        )
 
     if len(observable_config_path) > 1:
         _check_file_sorting(observable_config_path)
 
-        if time_slice is None:
+        if time_slice is None and time_range is None:
             raise ValueError(
                 "Multiple observable configurations"
                 f"(={len(observable_config_path)}) require a time "
@@ -96,24 +143,131 @@ def load_fields(
                 "Cannot animate from a single field configuration at a given"
                 f" time slice(={time_slice})."
             )
+        if time_range is not None:
+            raise ValueError(
+                "Cannot animate from a single field configuration at a given"
+                f" time range(={time_range})."
+            )
     else:
         raise ValueError("No configurations provided.")
 
-    data = []
+
+def iter_fields(
+    observable_config_path: list[Path],
+    n: int,
+    nt: int,
+    time_slice: Optional[int] = None,
+    time_range: Optional[tuple[int, int]] = None,
+) -> Iterator[np.ndarray]:
+    """Iterates over the frames of the provided path(s).
+
+    Frames are read one at a time, such that only a single frame needs to be
+    held in memory. See load_fields for a description of the arguments.
+
+    Yields:
+        frames of shape (n, n, n) in the order they are animated.
+    """
+
+    _check_load_arguments(observable_config_path, nt, time_slice, time_range)
+
+    if len(observable_config_path) == 1:
+
+        # Memory maps the configuration, such that each time slice is read
+        # when needed.
+        tqdm.write(f"{str(observable_config_path[0])}")
+        for frame in memmap_field(observable_config_path[0], n, nt):
+            metrics.increment("bytes_read", frame.nbytes)
+            yield frame
+
+        return
 
     for field_path in tqdm(
         observable_config_path,
         desc=f"Reading in data from {len(observable_config_path)} files."
     ):
         tqdm.write(f"{str(field_path)}")
-        data.append(
-            load_field_from_file(field_path, n, nt, euclidean_time=time_slice)
+        yield load_field_from_file(
+            field_path,
+            n,
+            nt,
+            euclidean_time=time_slice,
+            euclidean_time_range=time_range,
         )
 
-    # Making sure we return with zeroth axis as the one to animate with.
+
+def load_fields(
+    observable_config_path: list[Path],
+    n: int,
+    nt: int,
+    time_slice: Optional[int] = None,
+    time_range: Optional[tuple[int, int]] = None,
+    transforms: Optional[
+        list[Callable[[Iterable[np.ndarray]], Iterator[np.ndarray]]]
+    ] = None,
+) -> np.ndarray:
+    """Load data from provided path(s).
+
+    Assumes a input configurations is a hypercube of shape (n, n, n, nt) on
+    fortran ordering, i.e. column-major ordering.
+
+    Args:
+        observable_config_path (list(Path)): List of paths containing
+            observable(s) of configurations.
+        n (int): spatial points.
+        nt (int): temporal points.
+        time_slice (Optional[int], optional): time slice to render.
+        time_range (Optional[tuple[int, int]], optional): range [start, stop)
+            of time slices to average over, instead of a single time slice.
+        transforms (Optional[list[Callable]], optional): frame transforms,
+            see latviz.transforms, applied in order while the frames are
+            read.
+
+    Raises:
+        ValueError: if selected time slice exceeds temporal dimension, or
+            if the transforms do not preserve the number of frames.
+
+    Returns:
+        hypercube with the axis to animate over as the first axis, where
+        each frame is a Fortran contiguous array.
+    """
+
     if len(observable_config_path) == 1:
-        data = np.rollaxis(data[0], -1, 0)
+        n_frames = nt
     else:
-        data = np.asarray(data)
+        n_frames = len(observable_config_path)
+
+    frames: Iterable[np.ndarray] = iter_fields(
+        observable_config_path,
+        n,
+        nt,
+        time_slice=time_slice,
+        time_range=time_range,
+    )
+    for transform in transforms or []:
+        frames = transform(frames)
+
+    # Making sure we return with zeroth axis as the one to animate with. The
+    # frames are stored in (t, z, y, x) row-major order, such that each frame
+    # of the returned (t, x, y, z) view is column-major and contiguous, as
+    # expected for VTK point data.
+    metrics.start_stage("loading", total=n_frames)
+
+    data = np.empty((n_frames, n, n, n)).transpose(0, 3, 2, 1)
+    n_loaded = 0
+    for frame in frames:
+        if n_loaded == n_frames:
+            raise ValueError(
+                f"transforms yielded more than the {n_frames} frames read."
+            )
+
+        data[n_loaded] = frame
+        n_loaded += 1
+        metrics.increment("frames_loaded")
+        metrics.advance()
+
+    if n_loaded != n_frames:
+        raise ValueError(
+            f"transforms yielded {n_loaded} frames, expected {n_frames}."
+        )
 
     return data
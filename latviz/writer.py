@@ -0,0 +1,153 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from latviz.metrics import metrics
+
+FRAME_FORMATS = ("png", "webp", "npy")
+
+
+def write_frame(
+    image: np.ndarray,
+    fpath: Path,
+    frame_format: str = "png",
+    compression_level: int = 6,
+) -> None:
+    """
+    Writes an image array to file.
+
+    Args:
+        image: image array of shape (height, width, channels).
+        fpath: file path to write to.
+        frame_format: format of the frame. Available: 'png', 'webp' or 'npy'.
+            WebP frames are lossless.
+        compression_level: zlib compression level of png frames, from 0(no
+            compression) to 9.
+
+    Raises:
+        NameError: if frame_format is not recognized.
+    """
+    if frame_format == "png":
+        Image.fromarray(image).save(
+            fpath, format="PNG", compress_level=compression_level
+        )
+    elif frame_format == "webp":
+        Image.fromarray(image).save(fpath, format="WEBP", lossless=True)
+    elif frame_format == "npy":
+        np.save(fpath, image)
+    else:
+        raise NameError(f"{frame_format} is not a recognized frame format.")
+
+
+class FrameWriter:
+    """
+    Writes frames in background threads.
+
+    Frames are handed over as image arrays, such that the render loop does
+    not wait on compression and the file system. The number of frames waiting
+    to be written is bounded, blocking the render loop if the writers fall
+    behind. The queue depth is published to latviz.metrics.
+
+    Args:
+        frame_format: format of the frames. Available: 'png', 'webp' or
+            'npy'.
+        compression_level: zlib compression level of png frames, from 0(no
+            compression) to 9.
+        n_workers: number of writer threads.
+        max_queue_size: maximum number of frames waiting to be written.
+
+    Raises:
+        NameError: if frame_format is not recognized.
+    """
+
+    def __init__(
+        self,
+        frame_format: str = "png",
+        compression_level: int = 6,
+        n_workers: int = 4,
+        max_queue_size: int = 16,
+    ):
+        if frame_format not in FRAME_FORMATS:
+            raise NameError(
+                f"{frame_format} is not a recognized frame format."
+            )
+
+        self.frame_format = frame_format
+        self.compression_level = compression_level
+
+        self._executor = ThreadPoolExecutor(max_workers=n_workers)
+        self._slots = threading.BoundedSemaphore(max_queue_size)
+        self._error: Optional[BaseException] = None
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def __enter__(self) -> "FrameWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _set_pending(self, change: int) -> None:
+        with self._pending_lock:
+            self._pending += change
+            metrics.set_gauge("writer_queue_depth", self._pending)
+
+    def _done(self, future: Future) -> None:
+        self._slots.release()
+        self._set_pending(-1)
+        if future.exception() is None:
+            metrics.increment("frames_written")
+        elif self._error is None:
+            self._error = future.exception()
+
+    def write(self, image: np.ndarray, fpath: Path) -> Path:
+        """
+        Queues an image to be written.
+
+        Args:
+            image: image array of shape (height, width, channels).
+            fpath: file path without suffix. The suffix of the frame format
+                is appended.
+
+        Raises:
+            Exception: if writing a previous frame failed.
+
+        Returns:
+            the file path the frame will be written to.
+        """
+        if self._error is not None:
+            raise self._error
+
+        fpath = fpath.with_name(f"{fpath.name}.{self.frame_format}")
+
+        metrics.increment("frames_rendered")
+        metrics.advance()
+
+        self._slots.acquire()
+        self._set_pending(1)
+        future = self._executor.submit(
+            write_frame,
+            image,
+            fpath,
+            frame_format=self.frame_format,
+            compression_level=self.compression_level,
+        )
+        future.add_done_callback(self._done)
+
+        return fpath
+
+    def close(self) -> None:
+        """
+        Waits for all frames to be written.
+
+        Raises:
+            Exception: if writing a frame failed.
+        """
+        self._executor.shutdown(wait=True)
+
+        if self._error is not None:
+            raise self._error
@@ -0,0 +1,119 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from latviz.catalog import build_catalog, default_cache_dir, expand_inputs
+from latviz.utils import natural_sort_key
+
+
+def create_dummy_files(
+    folder: Path, config_numbers: list[int], size: int
+) -> list[Path]:
+    """Creates dummy configuration files of a given size in bytes."""
+    paths = []
+    for i in config_numbers:
+        path = folder / f"field_config{i}.bin"
+        path.write_bytes(np.zeros(size, dtype=np.uint8).tobytes())
+        paths.append(path)
+
+    return paths
+
+
+def test_natural_sort_key():
+    """Test that numbers are sorted by value."""
+    names = ["config10.bin", "config9.bin", "config100.bin", "config1.bin"]
+
+    assert sorted(names, key=natural_sort_key) == [
+        "config1.bin",
+        "config9.bin",
+        "config10.bin",
+        "config100.bin",
+    ]
+
+
+def test_expand_inputs():
+    """Test expanding folders, glob patterns and files."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+    folder_path = Path(folder.name)
+
+    paths = create_dummy_files(folder_path, [1, 2, 3], 8)
+    (folder_path / "notes.txt").write_text("not a configuration")
+
+    expanded, _ = expand_inputs([str(folder_path)])
+    assert set(expanded) == set(paths)
+
+    expanded, _ = expand_inputs([str(folder_path / "field_config[12].bin")])
+    assert set(expanded) == set(paths[:2])
+
+    expanded, _ = expand_inputs([str(paths[2])])
+    assert expanded == [paths[2]]
+
+    with pytest.raises(FileNotFoundError):
+        expand_inputs([str(folder_path / "missing_*.bin")])
+
+    folder.cleanup()
+
+
+def test_build_catalog():
+    """Test sorting, validation and caching of the catalog."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+    cache_folder = tempfile.TemporaryDirectory(suffix="_cache")
+    folder_path = Path(folder.name)
+    cache_path = Path(cache_folder.name)
+
+    n, nt = 2, 4
+    config_numbers = [100, 9, 10, 1]
+    paths = create_dummy_files(folder_path, config_numbers, n**3 * nt * 8)
+
+    catalog = build_catalog([str(folder_path)], n, nt, cache_dir=cache_path)
+    assert catalog == [paths[i] for i in np.argsort(config_numbers)]
+    assert len(list(cache_path.iterdir())) == 1
+
+    # Cached catalog is reused
+    assert build_catalog(
+        [str(folder_path)], n, nt, cache_dir=cache_path
+    ) == catalog
+
+    # Adding a file invalidates the cache
+    new_path = create_dummy_files(folder_path, [50], n**3 * nt * 8)[0]
+    catalog = build_catalog([str(folder_path)], n, nt, cache_dir=cache_path)
+    assert catalog[3] == new_path
+
+    # Files of the wrong size are rejected
+    create_dummy_files(folder_path, [1000], 8)
+    with pytest.raises(ValueError):
+        build_catalog([str(folder_path)], n, nt, cache_dir=cache_path)
+
+    folder.cleanup()
+    cache_folder.cleanup()
+
+
+def test_build_catalog_truncated_file():
+    """Test that files changed in place invalidate the cache."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+    cache_folder = tempfile.TemporaryDirectory(suffix="_cache")
+    folder_path = Path(folder.name)
+    cache_path = Path(cache_folder.name)
+
+    n, nt = 2, 4
+    paths = create_dummy_files(folder_path, [0, 1, 2], n**3 * nt * 8)
+    build_catalog([str(folder_path)], n, nt, cache_dir=cache_path)
+
+    # Truncating a file does not change the modification time of its folder
+    folder_mtime = folder_path.stat().st_mtime_ns
+    with open(paths[1], "r+b") as fp:
+        fp.truncate(8)
+    assert folder_path.stat().st_mtime_ns == folder_mtime
+
+    with pytest.raises(ValueError):
+        build_catalog([str(folder_path)], n, nt, cache_dir=cache_path)
+
+    folder.cleanup()
+    cache_folder.cleanup()
+
+
+def test_default_cache_dir(tmp_path):
+    """Test that tests do not write to the user cache."""
+    assert default_cache_dir() == tmp_path / "cache" / "latviz"
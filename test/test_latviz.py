@@ -4,12 +4,24 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import numpy as np
 import pytest
+import pyvista as pv
 from click.testing import CliRunner
 from loguru import logger
 
 from test_utils import create_dummy_field
-from latviz.latviz import create_animation, plot_iso_surface
+from latviz.animation import _concat_entry, _ffmpeg_command, _frame_paths
+from latviz.latviz import (
+    _point_data,
+    create_animation,
+    export_iso_surfaces,
+    orbit_views,
+    plot_iso_surface,
+    plot_orbit,
+    sweep_iso_surface,
+    sweep_variants,
+)
 from latviz.cli import latviz
+from latviz.mesh_io import MeshSequence
 
 
 runner = CliRunner()
@@ -84,6 +96,83 @@ def test_create_animation(animation_type: str):
     animation_folder.cleanup()
 
 
+def test_create_animation_frame_format():
+    """Test that raw frames are not encoded."""
+    with pytest.raises(ValueError):
+        create_animation(
+            Path("frames"), Path("."), "observable", "mp4", frame_format="npy"
+        )
+
+
+@pytest.mark.parametrize(
+    "n_jobs,segment_frames", [(0, 250), (2, 0), (2, -5)]
+)
+def test_segment_arguments(n_jobs, segment_frames):
+    """Test that non-positive encoding arguments are rejected."""
+    with pytest.raises(ValueError):
+        create_animation(
+            Path("frames"),
+            Path("."),
+            "observable",
+            "mp4",
+            n_jobs=n_jobs,
+            segment_frames=segment_frames,
+        )
+
+
+@pytest.mark.parametrize("animation_type", [("mp4"), ("avi")])
+def test_create_animation_segments(animation_type: str):
+    """Validation test of encoding segments in parallel."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+    animation_folder = tempfile.TemporaryDirectory(suffix="_animations")
+
+    frame_folder_path = Path(frame_folder.name)
+    animation_folder_path = Path(animation_folder.name)
+
+    observable = "observable"
+    animation_path = animation_folder_path / (
+        f"{observable.lower()}.{animation_type}"
+    )
+
+    for i in range(25):
+        create_dummy_frame((200, 200), frame_folder_path, f"frame_t{i:02d}")
+
+    create_animation(
+        frame_folder_path,
+        animation_folder_path,
+        observable,
+        animation_type,
+        n_jobs=3,
+        segment_frames=10,
+    )
+    assert animation_path.exists()
+
+    # Only the animation remains after the segments are joined
+    assert list(animation_folder_path.iterdir()) == [animation_path]
+
+    frame_folder.cleanup()
+    animation_folder.cleanup()
+
+
+@pytest.mark.parametrize("animation_type", [("mp4"), ("avi")])
+def test_ffmpeg_command_segment(animation_type: str):
+    """Test that segments select their frames and keep the frame rate."""
+    cmd = _ffmpeg_command(
+        animation_type,
+        Path("frame_t%02d.png"),
+        Path(f"segment.{animation_type}"),
+        frame_rate=24,
+        start_number=250,
+        n_frames=100,
+    )
+
+    assert cmd[cmd.index("-r") + 1] == "24"
+    assert cmd[cmd.index("-start_number") + 1] == "250"
+    assert cmd.index("-start_number") < cmd.index("-i")
+    assert cmd[cmd.index("-frames:v") + 1] == "100"
+    assert cmd[-1] == f"segment.{animation_type}"
+
+
 def test_plot_iso_surface():
     """Validation test on the plotting."""
     frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
@@ -105,6 +194,149 @@ def test_plot_iso_surface():
     frame_folder.cleanup()
 
 
+def test_point_data_zero_copy():
+    """Test that Fortran contiguous frames are passed to VTK without copy."""
+    n = 8
+    field = np.random.randn(3, n, n, n).transpose(0, 3, 2, 1)
+
+    grid = pv.UniformGrid()
+    grid.dimensions = field.shape[1:]
+
+    for volume in field:
+        grid.point_data["values"] = _point_data(volume)
+        assert np.shares_memory(grid.point_data["values"], volume)
+        assert np.array_equal(
+            grid.point_data["values"], volume.flatten(order="F")
+        )
+
+
+def test_plot_iso_surface_views():
+    """Validation test on plotting several views from the same contours."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+
+    frame_folder_path = Path(frame_folder.name)
+
+    n_cubes = 3
+    n = 16
+    views = [(0.0, 20.0, 1.0), (90.0, 20.0, 1.5)]
+
+    observable_name = "test_obs"
+    field = np.random.randn(n_cubes, n, n, n)
+
+    plot_iso_surface(field, observable_name, frame_folder_path, views=views)
+
+    for iv in range(len(views)):
+        for it in range(n_cubes):
+            view_folder = frame_folder_path / f"view_{iv:02d}"
+            assert (view_folder / f"frame_t{it:02d}.png").exists()
+
+    frame_folder.cleanup()
+
+
+def test_export_iso_surfaces():
+    """Validation test on exporting the contours as a mesh sequence."""
+    folder = tempfile.TemporaryDirectory(suffix="_meshes")
+    mesh_path = Path(folder.name) / "test_obs.lvmesh"
+
+    n_cubes = 5
+    n = 16
+    field = np.random.randn(n_cubes, n, n, n)
+
+    export_iso_surfaces(field, "test_obs", mesh_path, n_contours=5)
+
+    sequence = MeshSequence(mesh_path)
+    assert len(sequence) == n_cubes
+    assert np.allclose(sequence.clim, (field.min(), field.max()))
+
+    for it in range(n_cubes):
+        vertices, faces, scalars = sequence[it]
+        assert len(vertices) > 0
+        assert len(vertices) == len(scalars)
+        assert faces.max() < len(vertices)
+        assert np.all((vertices >= 0) & (vertices <= n - 1))
+
+    folder.cleanup()
+
+
+@pytest.mark.parametrize("n_views", [(1), (4), (36)])
+def test_orbit_views(n_views):
+    """Test that the orbit views are evenly spaced on a full circle."""
+    views = orbit_views(n_views, elevation=15.0, distance=2.0)
+
+    assert len(views) == n_views
+    azimuths = np.array([az for az, _, _ in views])
+    assert np.allclose(np.diff(azimuths), 360.0 / n_views)
+    assert all(el == 15.0 and d == 2.0 for _, el, d in views)
+
+
+def test_orbit_views_exception():
+    """Test that an empty orbit is rejected."""
+    with pytest.raises(ValueError):
+        orbit_views(0)
+
+
+def test_plot_orbit():
+    """Validation test on plotting an orbit around a single volume."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+
+    frame_folder_path = Path(frame_folder.name)
+
+    n = 16
+    views = orbit_views(12)
+
+    plot_orbit(np.random.randn(n, n, n), "test_obs", frame_folder_path, views)
+
+    for iv in range(len(views)):
+        assert (frame_folder_path / f"frame_t{iv:02d}.png").exists()
+
+    frame_folder.cleanup()
+
+
+def test_sweep_variants():
+    """Test of the grid of swept render parameters."""
+    variants = sweep_variants(
+        [10, 20], [None, -1.0], [1.0], ["plasma", "viridis", "coolwarm"]
+    )
+
+    assert len(variants) == 2 * 2 * 1 * 3
+    assert len(set(variant["label"] for variant in variants)) == len(variants)
+    assert variants[0] == {
+        "n_contours": 10,
+        "vmin": None,
+        "vmax": 1.0,
+        "cmap": "plasma",
+        "label": "c10_vminauto_vmax1_plasma",
+    }
+
+    # Close values are labeled by their exact values
+    variants = sweep_variants([10], [1e-7, 1.0000001e-7], [None], ["plasma"])
+    assert variants[0]["label"] != variants[1]["label"]
+
+    with pytest.raises(ValueError):
+        sweep_variants([10, 10], [None], [None], ["plasma"])
+
+
+def test_sweep_iso_surface():
+    """Validation test on plotting several render parameters."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+
+    frame_folder_path = Path(frame_folder.name)
+
+    n_cubes = 3
+    n = 16
+    field = np.random.randn(n_cubes, n, n, n)
+    variants = sweep_variants([5, 10], [None], [None], ["plasma", "viridis"])
+
+    sweep_iso_surface(field, "test_obs", frame_folder_path, variants)
+
+    for variant in variants:
+        variant_folder = frame_folder_path / variant["label"]
+        for it in range(n_cubes):
+            assert (variant_folder / f"frame_t{it:02d}.png").exists()
+
+    frame_folder.cleanup()
+
+
 @pytest.mark.parametrize(
     "n_fields", [(1), (10)]
 )
@@ -176,3 +408,81 @@ def test_latviz_cli(n_fields):
 
     output_folder.cleanup()
     frames_folder.cleanup()
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        (["--view", "0", "20", "1", "--orbit", "8"]),
+        (["--view", "0", "20", "1", "--sweep-cmap", "viridis"]),
+        (["--orbit", "8", "--sweep-n-contours", "5"]),
+        (["--orbit", "8", "--orbit-frame", "4"]),
+        (["--preview", "mip", "--export-meshes"]),
+        (["--preview", "mip", "--view", "0", "20", "1"]),
+        (["--preview", "slices", "--orbit", "8"]),
+        (["--preview", "slices", "--sweep-vmax", "1"]),
+        (["--export-meshes", "--view", "0", "20", "1"]),
+        (["--export-meshes", "--orbit", "8"]),
+        (["--export-meshes", "--sweep-cmap", "viridis"]),
+        (["--encode-jobs", "2", "--segment-frames", "0"]),
+        (["--encode-jobs", "0"]),
+        (["-n", "5"]),
+        (["missing_field.bin"]),
+        (["--transform", "failtest"]),
+        (["--transform", "rolling:abc"]),
+        (["--transform", "abs:3"]),
+    ],
+)
+def test_latviz_conflicting_options(options):
+    """Test that conflicting or out of range options are rejected."""
+    fields_folder = tempfile.TemporaryDirectory(suffix="_fields")
+    output_folder = tempfile.TemporaryDirectory(suffix="_output")
+
+    n, nt = 4, 4
+    field_path, _ = create_dummy_field(n, nt, Path(fields_folder.name))
+
+    response = runner.invoke(
+        latviz,
+        [
+            str(field_path),
+            "-n",
+            f"{n}",
+            "-nt",
+            f"{nt}",
+            "-o",
+            output_folder.name,
+            "--no-catalog-cache",
+            *options,
+        ],
+    )
+
+    assert response.exit_code == 2
+    assert not (Path(output_folder.name) / "frames").exists()
+
+    output_folder.cleanup()
+    fields_folder.cleanup()
+
+
+def test_concat_entry():
+    """Test that quotes in segment paths are escaped for ffmpeg."""
+    path = Path("/tmp/it's a folder/segment_0000.mp4")
+
+    assert _concat_entry(path) == (
+        "file '/tmp/it'\\''s a folder/segment_0000.mp4'\n"
+    )
+
+
+def test_frame_paths():
+    """Test that frames are ordered by their number, as encoded."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+    frame_folder_path = Path(frame_folder.name)
+
+    n_frames = 120
+    for it in reversed(range(n_frames)):
+        (frame_folder_path / f"frame_t{it:02d}.png").touch()
+
+    assert _frame_paths(frame_folder_path, "png") == [
+        frame_folder_path / f"frame_t{it:02d}.png" for it in range(n_frames)
+    ]
+
+    frame_folder.cleanup()
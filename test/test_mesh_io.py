@@ -0,0 +1,78 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from latviz.mesh_io import MeshSequence, write_mesh_sequence
+
+
+def create_dummy_mesh(
+    n_vertices: int, n_faces: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Creates a dummy triangle mesh"""
+    vertices = np.random.uniform(0, 32, size=(n_vertices, 3))
+    faces = np.random.randint(0, max(n_vertices, 1), size=(n_faces, 3))
+    scalars = np.random.randn(n_vertices)
+
+    return vertices, faces, scalars
+
+
+def test_mesh_sequence():
+    """Test of writing and reading back a mesh sequence."""
+    folder = tempfile.TemporaryDirectory(suffix="_meshes")
+    mesh_path = Path(folder.name) / "meshes.lvmesh"
+
+    meshes = [
+        create_dummy_mesh(n_vertices, n_faces)
+        for n_vertices, n_faces in [(101, 57), (0, 0), (7, 3), (1000, 2000)]
+    ]
+
+    n_frames = write_mesh_sequence(mesh_path, iter(meshes), clim=(-1.0, 2.0))
+    assert n_frames == len(meshes)
+
+    sequence = MeshSequence(mesh_path)
+    assert len(sequence) == len(meshes)
+    assert sequence.clim == (-1.0, 2.0)
+
+    # Reads the frames in reverse order, as a viewer seeking would
+    for it in reversed(range(len(meshes))):
+        vertices, faces, scalars = sequence[it]
+        assert np.allclose(vertices, meshes[it][0], atol=0.02)
+        assert np.array_equal(faces, meshes[it][1])
+        assert np.allclose(scalars, meshes[it][2], rtol=1e-6)
+
+    with pytest.raises(IndexError):
+        sequence[len(meshes)]
+
+    folder.cleanup()
+
+
+@pytest.mark.parametrize("scale", [1e-6, 1e5])
+def test_mesh_sequence_scalar_range(scale: float):
+    """Test that scalars keep their range and precision."""
+    folder = tempfile.TemporaryDirectory(suffix="_meshes")
+    mesh_path = Path(folder.name) / "meshes.lvmesh"
+
+    vertices, faces, scalars = create_dummy_mesh(7, 3)
+    scalars *= scale
+
+    write_mesh_sequence(mesh_path, [(vertices, faces, scalars)], clim=(0, 1))
+    _, _, read_scalars = MeshSequence(mesh_path)[0]
+
+    assert np.isfinite(read_scalars).all()
+    assert np.allclose(read_scalars, scalars, rtol=1e-6, atol=0)
+
+    folder.cleanup()
+
+
+def test_mesh_sequence_exception():
+    """Test that other files are rejected."""
+    folder = tempfile.TemporaryDirectory(suffix="_meshes")
+    path = Path(folder.name) / "field.bin"
+    path.write_bytes(np.zeros(64).tobytes())
+
+    with pytest.raises(ValueError):
+        MeshSequence(path)
+
+    folder.cleanup()
@@ -0,0 +1,85 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from test_utils import create_dummy_field
+from latviz.metrics import Metrics, metrics
+from latviz.utils import load_fields
+
+
+def test_metrics_snapshot():
+    """Test of the stage progress and counters."""
+    job_metrics = Metrics()
+
+    job_metrics.start_stage("rendering", total=10)
+    job_metrics.advance(4)
+    job_metrics.increment("frames_rendered", 4)
+    job_metrics.set_gauge("writer_queue_depth", 2)
+    time.sleep(0.01)
+
+    snapshot = job_metrics.snapshot()
+    assert snapshot["stage"] == "rendering"
+    assert snapshot["stage_done"] == 4
+    assert snapshot["stage_rate"] > 0
+    assert snapshot["stage_eta_seconds"] == pytest.approx(
+        6 / snapshot["stage_rate"]
+    )
+    assert snapshot["counters"] == {"frames_rendered": 4}
+    assert snapshot["gauges"] == {"writer_queue_depth": 2}
+    assert snapshot["resident_memory_bytes"] > 0
+    assert snapshot["peak_resident_memory_bytes"] > 0
+
+
+@pytest.mark.parametrize("suffix", [(".json"), (".prom")])
+def test_metrics_status_file(suffix):
+    """Test that the status file is written periodically."""
+    folder = tempfile.TemporaryDirectory(suffix="_metrics")
+    status_path = Path(folder.name) / f"status{suffix}"
+
+    job_metrics = Metrics()
+    job_metrics.start(status_path, interval=0.01)
+    assert status_path.exists()
+
+    job_metrics.start_stage("loading", total=3)
+    job_metrics.increment("bytes_read", 1024)
+    time.sleep(0.05)
+    job_metrics.stop()
+
+    content = status_path.read_text()
+    if suffix == ".json":
+        status = json.loads(content)
+        assert status["stage"] == "loading"
+        assert status["counters"]["bytes_read"] == 1024
+    else:
+        assert 'latviz_stage_info{stage="loading"} 1' in content
+        assert "latviz_bytes_read_total 1024" in content
+        assert "latviz_resident_memory_bytes" in content
+
+    # Only the status file remains after the atomic replacements
+    assert list(Path(folder.name).iterdir()) == [status_path]
+
+    folder.cleanup()
+
+
+def test_load_fields_metrics():
+    """Test that loading publishes the bytes read."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+
+    n, nt = 8, 16
+    field_paths = [
+        create_dummy_field(n, nt, Path(folder.name), name=f"field_{i:03d}")[0]
+        for i in range(4)
+    ]
+
+    bytes_read = metrics.snapshot()["counters"].get("bytes_read", 0)
+    load_fields(field_paths, n, nt, time_slice=2)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["bytes_read"] - bytes_read == 4 * n**3 * 8
+    assert snapshot["stage"] == "loading"
+    assert snapshot["stage_done"] == snapshot["stage_total"] == 4
+
+    folder.cleanup()
@@ -0,0 +1,117 @@
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from test_utils import create_dummy_field
+from latviz.cli import latviz
+from latviz.preview import colormap_lut, preview_frames, render_preview
+
+
+runner = CliRunner()
+
+
+def test_colormap_lut():
+    """Test of the color lookup table."""
+    lut = colormap_lut("viridis", n_colors=16)
+
+    assert lut.shape == (16, 3)
+    assert lut.dtype == np.uint8
+    assert not np.array_equal(lut[0], lut[-1])
+
+
+@pytest.mark.parametrize("mode", [("slices"), ("mip")])
+def test_preview_frames(mode):
+    """Test the shape and coloring of the preview frames."""
+    n_frames, n = 5, 9
+    field = np.random.randn(n_frames, n, n, n)
+
+    images = list(preview_frames(field, mode=mode, scale=3, chunk_size=2))
+
+    assert len(images) == n_frames
+    for image in images:
+        assert image.dtype == np.uint8
+        assert image.shape == (n * 3 + 1, (3 * n + 4) * 3 + 1, 3)
+
+    # The lowest and highest values are mapped to the ends of the table
+    lut = colormap_lut("plasma")
+    field[:] = 0.0
+    field[0, n // 2, n // 2, n // 2] = 1.0
+    image = next(preview_frames(field, mode=mode, scale=1))
+    assert (image == lut[-1]).all(axis=-1).sum() == 3
+    assert (image[:n, :n] == lut[0]).all(axis=-1).sum() == n * n - 1
+
+
+def test_preview_frames_exception():
+    """Test that unknown preview modes are rejected."""
+    with pytest.raises(NameError):
+        next(preview_frames(np.zeros((1, 4, 4, 4)), mode="failtest"))
+
+
+def test_render_preview():
+    """Validation test on writing preview frames."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+    frame_folder_path = Path(frame_folder.name)
+
+    n_frames = 12
+    render_preview(
+        np.random.randn(n_frames, 8, 8, 8), "test_obs", frame_folder_path
+    )
+
+    for it in range(n_frames):
+        assert (frame_folder_path / f"frame_t{it:02d}.png").exists()
+
+    frame_folder.cleanup()
+
+
+def test_preview_without_pyvista():
+    """Test that the preview does not import pyvista."""
+    cmd = [
+        sys.executable,
+        "-c",
+        (
+            "import sys, latviz.cli, latviz.preview; "
+            "assert 'pyvista' not in sys.modules"
+        ),
+    ]
+    assert subprocess.run(cmd).returncode == 0
+
+
+def test_latviz_cli_preview():
+    """Runs a validation test of the preview."""
+    fields_folder = tempfile.TemporaryDirectory(suffix="_fields")
+    output_folder = tempfile.TemporaryDirectory(suffix="_output")
+    output_folder_path = Path(output_folder.name)
+
+    n, nt = 16, 32
+    field_path, _ = create_dummy_field(n, nt, Path(fields_folder.name))
+
+    response = runner.invoke(
+        latviz,
+        [
+            str(field_path),
+            "-n",
+            f"{n}",
+            "-nt",
+            f"{nt}",
+            "-o",
+            str(output_folder_path),
+            "-a",
+            "avi",
+            "-m",
+            "obs",
+            "--preview",
+            "mip",
+            "--no-catalog-cache",
+        ],
+    )
+
+    assert response.exit_code == 0
+    assert (output_folder_path / "obs.avi").exists()
+
+    output_folder.cleanup()
+    fields_folder.cleanup()
@@ -0,0 +1,125 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from test_utils import create_dummy_field
+from latviz import LatViz
+from latviz.latviz import _create_scene
+
+
+def test_session_from_files():
+    """Test that a single configuration is memory mapped."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+
+    n, nt = 8, 16
+    field_path, field = create_dummy_field(n, nt, Path(folder.name))
+
+    session = LatViz.from_files([str(field_path)], n, nt, use_cache=False)
+
+    assert len(session) == nt
+    assert isinstance(session.field.base, np.memmap)
+    assert np.isclose(session.field_min, field.min())
+    assert np.isclose(session.field_max, field.max())
+
+    with pytest.raises(ValueError):
+        LatViz.from_files(
+            [str(field_path)], n, nt, time_slice=2, use_cache=False
+        )
+
+    session.close()
+    folder.cleanup()
+
+
+def test_session_contour_cache():
+    """Test that contours are reused until the contour levels change."""
+    n = 8
+    session = LatViz(np.random.randn(4, n, n, n), n_contours=5)
+
+    contour = session.contour(1)
+    assert session.contour(1) is contour
+    assert session.contour(2) is not contour
+
+    session.set_params(cmap="viridis")
+    assert session.contour(1) is contour
+
+    session.set_params(n_contours=6)
+    assert session.contour(1) is not contour
+
+    assert session.clim == (session.field_min, session.field_max)
+    session.set_params(vmin=-1.0)
+    assert session.clim == (-1.0, session.field_max)
+
+    with pytest.raises(TypeError):
+        session.set_params(colormap="viridis")
+
+    session.close()
+
+
+def test_session_contour_cache_size():
+    """Test that the contour cache is bounded."""
+    n = 8
+    session = LatViz(np.random.randn(6, n, n, n), contour_cache_size=2)
+
+    contours = [session.contour(it) for it in range(6)]
+    assert session.contour(5) is contours[5]
+    assert session.contour(0) is not contours[0]
+
+    session.close()
+
+
+def test_create_scene_reuse():
+    """Test that a reused plotter keeps its lights, and only one scene."""
+    n = 8
+    session = LatViz(np.random.randn(2, n, n, n), figsize=(320, 240))
+
+    p = _create_scene(
+        session._grid, session.contour(0), session.statistics(0), 0, -1, 1
+    )
+    n_lights = len(p.renderer.lights)
+    n_actors = len(p.renderer.actors)
+    assert n_lights > 0
+
+    for it in range(2):
+        p = _create_scene(
+            session._grid,
+            session.contour(it),
+            session.statistics(it),
+            it,
+            -1,
+            1,
+            plotter=p,
+        )
+        assert len(p.renderer.lights) == n_lights
+        assert len(p.renderer.actors) == n_actors
+        assert len(p.scalar_bars) == 1
+
+    p.close()
+    session.close()
+
+
+def test_session_render():
+    """Validation test on rendering frames with a reused plotter."""
+    frame_folder = tempfile.TemporaryDirectory(suffix="_frames")
+    frame_folder_path = Path(frame_folder.name)
+
+    n_cubes = 3
+    n = 16
+    figsize = (320, 240)
+
+    with LatViz(np.random.randn(n_cubes, n, n, n), figsize=figsize) as session:
+        image = session.render_frame(1)
+        assert image.shape[:2] == (figsize[1], figsize[0])
+
+        session.set_params(cmap="viridis")
+        assert session.render_frame(1, view=(90.0, 20.0, 1.0)).shape == (
+            image.shape
+        )
+
+        session.render_all(frame_folder_path)
+
+    for it in range(n_cubes):
+        assert (frame_folder_path / f"frame_t{it:02d}.png").exists()
+
+    frame_folder.cleanup()
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+
+from latviz.transforms import (
+    absolute,
+    gaussian_smooth,
+    parse_transform,
+    rolling_mean,
+    square,
+)
+
+
+def create_dummy_frames(n_frames: int, n: int) -> list[np.ndarray]:
+    """Creates dummy frames"""
+    return [np.random.randn(n, n, n) for _ in range(n_frames)]
+
+
+def test_absolute_and_square():
+    """Test of the element-wise transforms."""
+    frames = create_dummy_frames(5, 8)
+
+    for frame, result in zip(frames, absolute(frames)):
+        assert np.array_equal(np.abs(frame), result)
+
+    for frame, result in zip(frames, square(frames)):
+        assert np.allclose(frame ** 2, result)
+
+
+@pytest.mark.parametrize("window", [(1), (3), (10)])
+def test_rolling_mean(window):
+    """Test of the rolling average against a direct average."""
+    frames = create_dummy_frames(7, 8)
+
+    results = list(rolling_mean(iter(frames), window))
+
+    assert len(results) == len(frames)
+    for it, result in enumerate(results):
+        expected = np.mean(frames[max(0, it - window + 1):it + 1], axis=0)
+        assert np.allclose(expected, result)
+
+
+def test_rolling_mean_precision():
+    """Test that the rolling average does not accumulate errors."""
+    frames = [np.full(2, 1e17), np.ones(2), np.ones(2)]
+
+    results = list(rolling_mean(iter(frames), 1))
+
+    assert np.array_equal(results[1], frames[1])
+    assert np.array_equal(results[2], frames[2])
+
+
+def test_rolling_mean_exception():
+    """Test that a non-positive window is rejected."""
+    with pytest.raises(ValueError):
+        list(rolling_mean(create_dummy_frames(2, 4), 0))
+
+
+def test_gaussian_smooth():
+    """Test of the periodic smoothing of a point source."""
+    n = 16
+    frame = np.zeros((n, n, n))
+    frame[0, 0, 0] = 1.0
+
+    result = next(gaussian_smooth([frame], 1.5))
+
+    # Total is conserved, and the result is symmetric around the boundary
+    assert np.isclose(result.sum(), 1.0)
+    assert np.isclose(result[1, 0, 0], result[-1, 0, 0])
+    assert np.isclose(result[1, 0, 0], result[0, 0, 1])
+    assert result[0, 0, 0] == result.max()
+
+    # No smoothing leaves the frame unchanged
+    assert np.allclose(next(gaussian_smooth([frame], 0.0)), frame)
+
+    # The kernel is a Gaussian sampled on the lattice
+    x = np.arange(n // 2)
+    assert np.allclose(
+        result[: n // 2, 0, 0] / result[0, 0, 0],
+        np.exp(-0.5 * (x / 1.5) ** 2),
+        atol=1e-6,
+    )
+
+
+@pytest.mark.parametrize("sigma", [(0.3), (0.5), (2.0), (20.0)])
+def test_gaussian_smooth_non_negative(sigma):
+    """Test that smoothing a non-negative field stays non-negative."""
+    n = 8
+    point_source = np.zeros((n, n, n))
+    point_source[3, 0, 5] = 1.0
+    frames = [point_source, np.abs(np.random.randn(n, n, n))]
+
+    for frame, result in zip(frames, gaussian_smooth(frames, sigma)):
+        assert result.min() >= -1e-15
+        assert np.isclose(result.sum(), frame.sum())
+
+
+@pytest.mark.parametrize(
+    "spec,is_valid",
+    [
+        ("abs", True),
+        ("square", True),
+        ("rolling:4", True),
+        ("smooth:1.5", True),
+        ("rolling", False),
+        ("failtest", False),
+        ("rolling:abc", False),
+        ("rolling:0", False),
+        ("smooth:-1", False),
+        ("abs:3", False),
+        ("square:2", False),
+    ]
+)
+def test_parse_transform(spec, is_valid):
+    """Test of parsing transform specifications."""
+    frames = create_dummy_frames(3, 4)
+
+    if is_valid:
+        transform = parse_transform(spec)
+        assert len(list(transform(frames))) == len(frames)
+    else:
+        with pytest.raises(ValueError):
+            parse_transform(spec)
@@ -7,6 +7,7 @@ import pytest
 from _pytest.logging import caplog as _caplog  # noqa: F401
 from loguru import logger
 
+from latviz.transforms import parse_transform
 from latviz.utils import load_field_from_file, load_fields, _check_file_sorting
 
 
@@ -95,6 +96,19 @@ def test__check_file_sorting(caplog):
     ) in caplog.record_tuples[0][2]
 
 
+def test__check_file_sorting_folders(caplog):
+    """Test that files sorted by the catalog across folders are accepted."""
+    test_paths = [
+        Path(f"run{run}") / f"field_{i:04d}.bin"
+        for run in (2, 10)
+        for i in (9, 10)
+    ]
+
+    _check_file_sorting(test_paths)
+
+    assert len(caplog.record_tuples) == 0
+
+
 @pytest.mark.parametrize(
     "n_fields,n,nt,time_slice",
     [
@@ -193,3 +207,89 @@ def test_load_fields(n_fields, n, nt, time_slice):
             assert np.array_equal(field, loaded_data)
 
     folder.cleanup()
+
+
+@pytest.mark.parametrize(
+    "n_fields,n,nt,time_range",
+    [
+        (10, 16, 32, (0, 4)),
+        (5, 16, 32, (30, 32)),
+    ]
+)
+def test_load_fields_time_range(n_fields, n, nt, time_range):
+    """Test for averaging multiple fields over a range of time slices."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+
+    fields = [
+        create_dummy_field(n, nt, Path(folder.name), name=f"field_{i:03d}")
+        for i in range(n_fields)
+    ]
+    field_paths = [i for i, j in fields]
+    fields = [j[time_range[0]:time_range[1]].mean(axis=0) for i, j in fields]
+
+    loaded_fields = load_fields(field_paths, n, nt, time_range=time_range)
+
+    for field, loaded_data in zip(fields, loaded_fields):
+        loaded_data = np.rollaxis(loaded_data, -1, 0)
+        loaded_data = np.rollaxis(loaded_data, 2, 1)
+        assert np.allclose(field, loaded_data)
+
+    with pytest.raises(ValueError):
+        load_fields(field_paths, n, nt, time_slice=0, time_range=time_range)
+
+    folder.cleanup()
+
+
+def test_load_fields_transforms():
+    """Test for applying transforms while loading."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+
+    n, nt = 16, 32
+    field_path, _ = create_dummy_field(n, nt, Path(folder.name))
+
+    loaded_fields = load_fields([field_path], n, nt)
+    transformed_fields = load_fields(
+        [field_path], n, nt, transforms=[parse_transform("square")]
+    )
+
+    assert np.allclose(loaded_fields ** 2, transformed_fields)
+
+    folder.cleanup()
+
+
+@pytest.mark.parametrize("n_yielded", [(31), (33)])
+def test_load_fields_transforms_exception(n_yielded):
+    """Test that transforms changing the number of frames are rejected."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+
+    n, nt = 4, 32
+    field_path, _ = create_dummy_field(n, nt, Path(folder.name))
+
+    def resample(frames):
+        frames = list(frames)
+        for it in range(n_yielded):
+            yield frames[it % len(frames)]
+
+    with pytest.raises(ValueError):
+        load_fields([field_path], n, nt, transforms=[resample])
+
+    folder.cleanup()
+
+
+@pytest.mark.parametrize("n_fields,time_slice", [(1, None), (5, 3)])
+def test_load_fields_layout(n_fields, time_slice):
+    """Test that each loaded frame is contiguous in column-major order."""
+    folder = tempfile.TemporaryDirectory(suffix="_fields")
+
+    n, nt = 8, 16
+    field_paths = [
+        create_dummy_field(n, nt, Path(folder.name), name=f"field_{i:03d}")[0]
+        for i in range(n_fields)
+    ]
+
+    loaded_fields = load_fields(field_paths, n, nt, time_slice=time_slice)
+
+    for frame in loaded_fields:
+        assert frame.flags.f_contiguous
+
+    folder.cleanup()
@@ -0,0 +1,50 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from latviz.writer import FrameWriter
+
+
+def create_dummy_image(height: int, width: int) -> np.ndarray:
+    """Creates dummy image"""
+    return np.random.randint(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("frame_format", [("png"), ("webp"), ("npy")])
+def test_frame_writer(frame_format):
+    """Test that frames are written losslessly in the background."""
+    folder = tempfile.TemporaryDirectory(suffix="_frames")
+    folder_path = Path(folder.name)
+
+    images = [create_dummy_image(64, 48) for _ in range(20)]
+
+    with FrameWriter(frame_format, max_queue_size=2) as writer:
+        fpaths = [
+            writer.write(image, folder_path / f"frame_t{it:02d}")
+            for it, image in enumerate(images)
+        ]
+
+    for image, fpath in zip(images, fpaths):
+        assert fpath.name.endswith(f".{frame_format}")
+        if frame_format == "npy":
+            loaded = np.load(fpath)
+        else:
+            loaded = np.asarray(Image.open(fpath).convert("RGB"))
+        assert np.array_equal(image, loaded)
+
+    folder.cleanup()
+
+
+def test_frame_writer_exceptions():
+    """Test that unknown formats and failed writes are raised."""
+    with pytest.raises(NameError):
+        FrameWriter("failtest")
+
+    writer = FrameWriter("png")
+    writer.write(create_dummy_image(8, 8), Path("/missing_folder/frame_t00"))
+
+    with pytest.raises(FileNotFoundError):
+        writer.close()